@@ -0,0 +1,193 @@
+# foodTour.py
+# -----------
+# Licensing Information:  You are free to use or extend these projects for
+# educational purposes provided that (1) you do not distribute or publish
+# solutions, (2) you retain this notice, and (3) you provide clear
+# attribution to UC Berkeley, including a link to http://ai.berkeley.edu.
+#
+# Attribution Information: The Pacman AI projects were developed at UC Berkeley.
+# The core projects and autograders were primarily created by John DeNero
+# (denero@cs.berkeley.edu) and Dan Klein (klein@cs.berkeley.edu).
+# Student side autograding was added by Brad Miller, Nick Hay, and
+# Pieter Abbeel (pabbeel@cs.berkeley.edu).
+
+
+"""
+Plans the order in which Pacman eats all of the food, as a travelling
+salesman path over maze distances, instead of searching the (position, food
+set) state space.
+
+Any path that eats all the food visits the dots in some order, and costs at
+least the sum of the maze distances between consecutive dots of that order.
+The shortest order is therefore an optimal FoodSearchProblem solution.  With
+at most EXACT_LIMIT dots it is found exactly with the Held-Karp dynamic
+program over subsets; with more, a nearest neighbor order is improved by
+2-opt and Or-opt moves until no move helps or the time limit is reached.
+
+Usage:
+  python pacman.py -l mediumSearch -p FoodTourAgent
+"""
+
+import time
+import mazeDistances
+
+# Held-Karp is used up to this many dots; its cost grows as n^2 2^n
+EXACT_LIMIT = 13
+
+def planFoodTour(start, foods, maze, exactLimit=EXACT_LIMIT, timeLimit=1.0):
+    """
+    Returns (order, cost): the foods reordered into a short path from start
+    and its length, using the maze distances of a DistanceTable or
+    DistanceFields (see mazeDistances.getMazeDistances).  The path is optimal
+    when there are at most exactLimit foods.  Returns (None, None) if a food
+    cannot be reached.
+    """
+    stops = [start] + list(foods)
+    cells = [maze.index[stop] for stop in stops]
+    # only the distances between stops are kept, not their whole fields
+    distances = []
+    for stop in stops:
+        row = maze.getDistances(stop)
+        distances.append([row[cell] for cell in cells])
+    if any(d == mazeDistances.UNREACHABLE for d in distances[0]):
+        return None, None
+
+    if len(foods) <= exactLimit:
+        tour = _heldKarp(distances)
+    else:
+        tour = _improveTour(_nearestNeighborTour(distances), distances, timeLimit)
+    return [stops[i] for i in tour[1:]], _tourCost(tour, distances)
+
+def foodTourSearch(problem, exactLimit=EXACT_LIMIT, timeLimit=1.0):
+    """
+    Returns the actions that eat all of the food of a FoodSearchProblem along
+    the planned tour, by walking shortest maze paths between the dots.
+    """
+    maze = mazeDistances.getMazeDistances(problem.walls)
+    position, foodMask = problem.getStartState()
+    foods = [food for i, food in enumerate(problem.foodPositions) if foodMask >> i & 1]
+    order, cost = planFoodTour(position, foods, maze, exactLimit, timeLimit)
+    if order is None:
+        return None
+    actions = []
+    for food in order:
+        actions.extend(maze.getPath(position, food))
+        position = food
+    return actions
+
+def _tourCost(tour, distances):
+    return sum(distances[tour[i]][tour[i + 1]] for i in range(len(tour) - 1))
+
+def _heldKarp(distances):
+    """
+    Returns the shortest path from stop 0 through all other stops.
+    best[mask][j] is the length of the shortest path from stop 0 through the
+    stops in mask (bit j-1 for stop j) that ends at stop j.
+    """
+    n = len(distances) - 1
+    if n == 0:
+        return [0]
+    full = (1 << n) - 1
+    infinity = float('inf')
+    best = [[infinity] * (n + 1) for _ in range(full + 1)]
+    parent = [[0] * (n + 1) for _ in range(full + 1)]
+    for j in range(1, n + 1):
+        best[1 << (j - 1)][j] = distances[0][j]
+
+    for mask in range(1, full + 1):
+        row = best[mask]
+        for j in range(1, n + 1):
+            cost = row[j]
+            if cost == infinity or not mask >> (j - 1) & 1:
+                continue
+            fromJ = distances[j]
+            for k in range(1, n + 1):
+                bit = 1 << (k - 1)
+                if mask & bit:
+                    continue
+                nextCost = cost + fromJ[k]
+                if nextCost < best[mask | bit][k]:
+                    best[mask | bit][k] = nextCost
+                    parent[mask | bit][k] = j
+
+    last = min(range(1, n + 1), key=lambda j: best[full][j])
+    tour = []
+    mask = full
+    while last:
+        tour.append(last)
+        last, mask = parent[mask][last], mask & ~(1 << (last - 1))
+    tour.append(0)
+    tour.reverse()
+    return tour
+
+def _nearestNeighborTour(distances):
+    "Starts at stop 0 and repeatedly walks to the nearest unvisited stop"
+    unvisited = set(range(1, len(distances)))
+    tour = [0]
+    while unvisited:
+        row = distances[tour[-1]]
+        nearest = min(unvisited, key=lambda j: row[j])
+        unvisited.remove(nearest)
+        tour.append(nearest)
+    return tour
+
+def _improveTour(tour, distances, timeLimit):
+    """
+    Applies improving 2-opt moves (reverse a segment) and Or-opt moves (move
+    a run of one to three stops elsewhere) until none is left or timeLimit
+    seconds have passed.  Stop 0 stays first and the path is open, so the
+    last stop has no successor.  The time is checked before every segment
+    start i, so the limit is overrun by at most one O(n) scan.
+    """
+    deadline = time.perf_counter() + timeLimit
+    n = len(tour)
+    d = distances
+
+    def edge(i, j):
+        "The length of the edge from tour position i to j, 0 past the end"
+        if j >= n:
+            return 0
+        return d[tour[i]][tour[j]]
+
+    improved = True
+    while improved:
+        improved = False
+
+        # 2-opt: reverse tour[i..j]
+        for i in range(1, n - 1):
+            if time.perf_counter() > deadline:
+                return tour
+            for j in range(i + 1, n):
+                before = edge(i - 1, i) + edge(j, j + 1)
+                after = d[tour[i - 1]][tour[j]] + (d[tour[i]][tour[j + 1]] if j + 1 < n else 0)
+                if after < before:
+                    tour[i:j + 1] = reversed(tour[i:j + 1])
+                    improved = True
+
+        # Or-opt: move tour[i:i+length] between the stops at positions p and
+        # p+1, where p+1 skips over the segment
+        for length in (1, 2, 3):
+            for i in range(1, n - length + 1):
+                if time.perf_counter() > deadline:
+                    return tour
+                first, last = tour[i], tour[i + length - 1]
+                removed = edge(i - 1, i) + edge(i + length - 1, i + length) - edge(i - 1, i + length)
+                bestGain, bestP = 0, None
+                for p in range(n):
+                    if i - 1 <= p < i + length:
+                        continue
+                    stop = tour[p]
+                    if p + 1 < n:
+                        nextStop = tour[p + 1]
+                        added = d[stop][first] + d[last][nextStop] - d[stop][nextStop]
+                    else:
+                        added = d[stop][first]
+                    if removed - added > bestGain:
+                        bestGain, bestP = removed - added, p
+                if bestP is not None:
+                    segment = tour[i:i + length]
+                    del tour[i:i + length]
+                    at = bestP + 1 if bestP < i else bestP + 1 - length
+                    tour[at:at] = segment
+                    improved = True
+    return tour
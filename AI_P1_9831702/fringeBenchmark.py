@@ -0,0 +1,125 @@
+# fringeBenchmark.py
+# ------------------
+# Licensing Information:  You are free to use or extend these projects for
+# educational purposes provided that (1) you do not distribute or publish
+# solutions, (2) you retain this notice, and (3) you provide clear
+# attribution to UC Berkeley, including a link to http://ai.berkeley.edu.
+#
+# Attribution Information: The Pacman AI projects were developed at UC Berkeley.
+# The core projects and autograders were primarily created by John DeNero
+# (denero@cs.berkeley.edu) and Dan Klein (klein@cs.berkeley.edu).
+# Student side autograding was added by Brad Miller, Nick Hay, and
+# Pieter Abbeel (pabbeel@cs.berkeley.edu).
+
+
+"""
+Micro-benchmark for the fringe containers in util.py.
+
+Every container is filled with n items and then drained, for n from 10^3 up
+to 10^maxPower.  The time per operation should stay roughly flat as n grows;
+a container whose time per operation grows with n has an O(n) push or pop.
+
+The .update rows push every item with a priority one too high and then
+lower it with update, as uniform cost search and A* do when they find a
+cheaper path (decrease-key).  PriorityQueue.update scans the whole heap, so
+its row is only run up to 10^UPDATE_SCAN_MAX_POWER items.
+
+> python fringeBenchmark.py
+> python fringeBenchmark.py --maxPower 7 --repeat 3
+"""
+
+import random
+import time
+import util
+
+def _fillAndDrain(fringe, push, items):
+    for item in items:
+        push(fringe, item)
+    while not fringe.isEmpty():
+        fringe.pop()
+
+def _pushStack(fringe, item):
+    fringe.push(item)
+
+def _pushPriority(fringe, item):
+    fringe.push(item, item[0])
+
+def _pushAndLower(fringe, item):
+    fringe.push(item, item[0] + 1)
+    fringe.update(item, item[0])
+
+# Largest power of ten the O(n) PriorityQueue.update is timed at
+UPDATE_SCAN_MAX_POWER = 4
+
+# (name, fringe factory, push function, largest power of ten or None)
+CONTAINERS = [
+    ('Stack', util.Stack, _pushStack, None),
+    ('Queue', util.Queue, _pushStack, None),
+    ('PriorityQueue', util.PriorityQueue, _pushPriority, None),
+    ('IndexedPriorityQueue', util.IndexedPriorityQueue, _pushPriority, None),
+    ('PriorityQueue.update', util.PriorityQueue, _pushAndLower, UPDATE_SCAN_MAX_POWER),
+    ('IndexedPriorityQueue.update', util.IndexedPriorityQueue, _pushAndLower, None),
+    ('PriorityQueueWithFunction', lambda: util.PriorityQueueWithFunction(lambda item: item[0]), _pushStack, None),
+]
+
+def timeContainer(makeFringe, push, n, repeat=1, seed=0):
+    """
+    Returns the best time, in seconds, of pushing n items into a new fringe
+    and popping them all again.
+    """
+    rand = random.Random(seed)
+    items = [(rand.random(), i) for i in range(n)]
+    best = None
+    for _ in range(repeat):
+        fringe = makeFringe()
+        start = time.perf_counter()
+        _fillAndDrain(fringe, push, items)
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+def runBenchmark(minPower=3, maxPower=6, repeat=1, containers=CONTAINERS):
+    """
+    Times every container at n = 10^minPower .. 10^maxPower, or up to its
+    own largest power, and returns a list of (name, n, seconds) rows.
+    """
+    rows = []
+    for power in range(minPower, maxPower + 1):
+        n = 10 ** power
+        for name, makeFringe, push, largestPower in containers:
+            if largestPower is None or power <= largestPower:
+                rows.append((name, n, timeContainer(makeFringe, push, n, repeat)))
+    return rows
+
+def printRows(rows):
+    print('%-28s %10s %12s %14s' % ('container', 'n', 'seconds', 'ns per op'))
+    for name, n, seconds in rows:
+        # one push and one pop per item (the update rows count push and
+        # update as one push)
+        print('%-28s %10d %12.4f %14.1f' % (name, n, seconds, seconds * 1e9 / (2 * n)))
+
+def readCommand(argv):
+    from optparse import OptionParser
+    parser = OptionParser(usage=__doc__)
+    parser.add_option('--minPower', dest='minPower', type='int', default=3,
+                      help='smallest fringe size as a power of ten (default %default)')
+    parser.add_option('--maxPower', dest='maxPower', type='int', default=6,
+                      help='largest fringe size as a power of ten, up to 7 (default %default)')
+    parser.add_option('--repeat', dest='repeat', type='int', default=1,
+                      help='runs per measurement, the best one is reported (default %default)')
+    parser.add_option('--containers', dest='containers', default='',
+                      help='comma separated subset of %s' % ','.join(container[0] for container in CONTAINERS))
+    options, otherjunk = parser.parse_args(argv)
+    if len(otherjunk) != 0:
+        raise Exception('Command line input not understood: ' + str(otherjunk))
+    return options
+
+if __name__ == '__main__':
+    import sys
+    options = readCommand(sys.argv[1:])
+    containers = CONTAINERS
+    if options.containers:
+        wanted = options.containers.split(',')
+        containers = [c for c in CONTAINERS if c[0] in wanted]
+    printRows(runBenchmark(options.minPower, options.maxPower, options.repeat, containers))
@@ -0,0 +1,133 @@
+# layoutCompiler.py
+# -----------------
+# Licensing Information:  You are free to use or extend these projects for
+# educational purposes provided that (1) you do not distribute or publish
+# solutions, (2) you retain this notice, and (3) you provide clear
+# attribution to UC Berkeley, including a link to http://ai.berkeley.edu.
+#
+# Attribution Information: The Pacman AI projects were developed at UC Berkeley.
+# The core projects and autograders were primarily created by John DeNero
+# (denero@cs.berkeley.edu) and Dan Klein (klein@cs.berkeley.edu).
+# Student side autograding was added by Brad Miller, Nick Hay, and
+# Pieter Abbeel (pabbeel@cs.berkeley.edu).
+
+
+"""
+Compiles a walls grid into a neighbor table shared by the search problems.
+
+The open cells of a layout are numbered once, and the legal moves out of
+every cell are stored as (neighbor index, action) entries.  Search problems
+then expand a state with a few list lookups instead of calling
+Actions.directionToVector and indexing the walls grid for every direction.
+Compiled layouts are cached per layout (see WallsCache), so every problem
+built on the same layout shares one table.
+
+Usage:
+  layout = compileLayout(gameState.getWalls())
+  for neighbor, action in layout.moves[layout.index[(x, y)]]:
+      ...
+"""
+
+import hashlib
+import weakref
+import util
+from game import Directions
+from game import Actions
+
+# The order in which moves are listed for every cell
+DIRECTIONS = [Directions.NORTH, Directions.SOUTH, Directions.EAST, Directions.WEST]
+
+# Layouts a WallsCache keeps by default
+WALLS_CACHE_SIZE = 16
+
+# id(walls) -> (weak reference to walls, wallsKey(walls)) for live grids
+_keys = {}
+
+def wallsKey(walls):
+    """
+    Returns a hex digest that identifies the walls grid.  The digest of a
+    grid object is remembered while the grid lives, so asking again for the
+    same object is a dictionary lookup.
+    """
+    entry = _keys.get(id(walls))
+    if entry is not None and entry[0]() is walls:
+        return entry[1]
+    digest = hashlib.sha1(('%d,%d;' % (walls.width, walls.height)).encode())
+    digest.update(bytes([walls[x][y] for x in range(walls.width) for y in range(walls.height)]))
+    key = digest.hexdigest()
+    gridId = id(walls)
+    _keys[gridId] = (weakref.ref(walls, lambda ref: _forgetKey(gridId, ref)), key)
+    return key
+
+def _forgetKey(gridId, ref):
+    "Drops the digest of a freed walls grid, unless a new grid reuses its id already"
+    entry = _keys.get(gridId)
+    if entry is not None and entry[0] is ref:
+        del _keys[gridId]
+
+def openCells(walls):
+    "Returns the positions of all non-wall cells, in a fixed (column major) order"
+    return [(x, y) for x in range(walls.width) for y in range(walls.height) if not walls[x][y]]
+
+class CompiledLayout:
+    """
+    The open cells of a walls grid and the moves between them.
+
+      cells[i]:  the (x,y) position of cell i
+      index:     a dictionary from positions back to cell indices
+      moves[i]:  a tuple of (neighbor index, action) entries, one for every
+                 legal move out of cell i, in DIRECTIONS order
+    """
+    def __init__(self, walls):
+        self.walls = walls
+        self.width, self.height = walls.width, walls.height
+        self.cells = openCells(walls)
+        self.index = dict((cell, i) for i, cell in enumerate(self.cells))
+        self.size = len(self.cells)
+
+        vectors = [(action, Actions.directionToVector(action)) for action in DIRECTIONS]
+        self.moves = []
+        for x, y in self.cells:
+            moves = []
+            for action, (dx, dy) in vectors:
+                neighbor = self.index.get((int(x + dx), int(y + dy)))
+                if neighbor is not None:
+                    moves.append((neighbor, action))
+            self.moves.append(tuple(moves))
+
+    def cellCosts(self, costFn):
+        """
+        Returns a list with costFn(position) for every cell, so that the cost
+        of stepping into cell i is a lookup instead of a function call.
+        """
+        return [costFn(cell) for cell in self.cells]
+
+class WallsCache:
+    """
+    Objects built from walls grids, kept for the capacity most recently used
+    layouts.  Entries are keyed by wallsKey, so the copy of the walls grid
+    that every game state carries finds the same entry, and the cache keeps
+    no grid alive.  onEvict, if given, is called with every object dropped.
+    """
+    def __init__(self, capacity=WALLS_CACHE_SIZE, onEvict=None):
+        self.entries = util.LRUCache(capacity, onEvict)
+
+    def get(self, walls, build, *extra):
+        """
+        Returns the object stored for walls and the extra key parts, calling
+        build() to make it the first time.
+        """
+        key = (wallsKey(walls),) + extra
+        value = self.entries.get(key)
+        if value is None:
+            value = self.entries[key] = build()
+        return value
+
+_layouts = WallsCache()
+
+def compileLayout(walls):
+    """
+    Returns the CompiledLayout for walls.  Layouts are cached, so compiling
+    the same layout again is a dictionary lookup.
+    """
+    return _layouts.get(walls, lambda: CompiledLayout(walls))
@@ -0,0 +1,349 @@
+# mazeDistances.py
+# ----------------
+# Licensing Information:  You are free to use or extend these projects for
+# educational purposes provided that (1) you do not distribute or publish
+# solutions, (2) you retain this notice, and (3) you provide clear
+# attribution to UC Berkeley, including a link to http://ai.berkeley.edu.
+#
+# Attribution Information: The Pacman AI projects were developed at UC Berkeley.
+# The core projects and autograders were primarily created by John DeNero
+# (denero@cs.berkeley.edu) and Dan Klein (klein@cs.berkeley.edu).
+# Student side autograding was added by Brad Miller, Nick Hay, and
+# Pieter Abbeel (pabbeel@cs.berkeley.edu).
+
+
+"""
+All-pairs maze distances for a walls grid.
+
+A DistanceTable numbers the open cells of a layout and stores the shortest
+path length between every pair of them in one flat int16 matrix, so a
+distance query is a single lookup.  The matrix is computed with one BFS per
+open cell and written to a file in CACHE_DIR named after a hash of the
+walls; later runs on the same layout memory-map that file instead of
+computing it again.  saveArray and loadArray do the same for other cached
+arrays (see patternDatabase.py).
+
+Usage:
+  table = getDistanceTable(gameState.getWalls())
+  table.getDistance((2,4), (5,6))
+
+For layouts too large for an all-pairs table, or with step costs, a
+DistanceFields object answers the same queries from single-source distance
+fields: one BFS (or Dijkstra, with costs) per source, with the most recent
+fields kept in an LRU cache.  Both answer batches of queries at once:
+
+  fields = getDistanceFields(gameState.getWalls())
+  fields.batchDistances((2,4), foodList)          # one source, many targets
+  fields.pairDistances([(a, b), (c, d), (a, e)])  # grouped by source
+
+getMazeDistances picks between the two by the size of the layout, for code
+that just needs maze distances and paths on any board:
+
+  distances = getMazeDistances(gameState.getWalls())
+"""
+
+import array
+import collections
+import heapq
+import mmap
+import os
+import tempfile
+import layoutCompiler
+import util
+from game import Directions
+
+# Directory holding the cached tables; None keeps tables in memory only
+CACHE_DIR = os.path.join(tempfile.gettempdir(), 'pacmanDistanceCache')
+
+# Distance stored for a pair of cells that are not connected
+UNREACHABLE = -1
+
+# The matrix is stored as signed 16 bit integers
+MAX_CELLS = 32767
+
+class DistanceTable:
+    """
+    Shortest path lengths between every pair of open cells of a walls grid.
+
+    Cells are numbered as in the CompiledLayout of the walls (see
+    layoutCompiler.py): cells[i] is the position with index i, index maps
+    positions back to indices and the distance from cell i to cell j is
+    distances[i*size + j].
+    """
+    def __init__(self, walls, cacheDir=CACHE_DIR):
+        self.layout = layoutCompiler.compileLayout(walls)
+        self.cells = self.layout.cells
+        self.index = self.layout.index
+        self.size = self.layout.size
+        if self.size > MAX_CELLS:
+            raise ValueError('Layout has %d open cells, a distance table supports at most %d' % (self.size, MAX_CELLS))
+        self.key = layoutCompiler.wallsKey(walls)
+
+        path = None
+        if cacheDir is not None and self.size > 0:
+            path = os.path.join(cacheDir, self.key + '.dist')
+            self.distances = loadArray(path, 'h', self.size * self.size)
+            if self.distances is not None:
+                return
+        self.distances = self._compute()
+        if path is not None:
+            saveArray(path, self.distances)
+            loaded = loadArray(path, 'h', self.size * self.size)
+            if loaded is not None:
+                self.distances = loaded
+
+    def getDistance(self, pos1, pos2):
+        "Returns the maze distance between two open positions, or UNREACHABLE"
+        index = self.index
+        return self.distances[index[pos1] * self.size + index[pos2]]
+
+    def getDistances(self, pos):
+        "Returns the distances from pos to every cell, ordered like self.cells"
+        start = self.index[pos] * self.size
+        return self.distances[start:start + self.size]
+
+    def batchDistances(self, source, targets):
+        "Returns an array with the distance from source to each position in targets"
+        return _batchDistances(self.getDistances(source), self.index, targets, 'h')
+
+    def pairDistances(self, pairs):
+        "Returns an array with the distance of each (source, target) pair"
+        return _pairDistances(self.getDistances, self.index, pairs, 'h')
+
+    def getPath(self, pos1, pos2):
+        """
+        Returns a shortest list of actions from pos1 to pos2, or None if pos2
+        cannot be reached.  The path walks down the distance field of pos2,
+        so it costs one lookup per step and no search.
+        """
+        moves = self.layout.moves
+        field = self.getDistances(pos2)
+        cell = self.index[pos1]
+        distance = field[cell]
+        if distance == UNREACHABLE:
+            return None
+        actions = []
+        while distance > 0:
+            for neighbor, action in moves[cell]:
+                if field[neighbor] == distance - 1:
+                    actions.append(action)
+                    cell = neighbor
+                    distance -= 1
+                    break
+        return actions
+
+    def _compute(self):
+        "Runs one breadth first search per open cell"
+        size = self.size
+        neighbors = [[neighbor for neighbor, action in moves] for moves in self.layout.moves]
+
+        distances = array.array('h', [UNREACHABLE]) * (size * size)
+        for source in range(size):
+            row = [UNREACHABLE] * size
+            row[source] = 0
+            fringe = collections.deque([source])
+            while fringe:
+                cell = fringe.popleft()
+                nextDistance = row[cell] + 1
+                for n in neighbors[cell]:
+                    if row[n] == UNREACHABLE:
+                        row[n] = nextDistance
+                        fringe.append(n)
+            distances[source * size:(source + 1) * size] = array.array('h', row)
+        return distances
+
+    def close(self):
+        """
+        Releases the memory-mapped file, if any.  The table must not be used
+        afterwards; rows it returned stay valid, and the map is unmapped
+        when the last of them is freed.
+        """
+        if isinstance(self.distances, memoryview):
+            self.distances.release()
+
+def saveArray(path, values):
+    "Writes an array to path; the cache is only an optimization, so failures are ignored"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmpPath = '%s.%d.tmp' % (path, os.getpid())
+        with open(tmpPath, 'wb') as f:
+            values.tofile(f)
+        os.replace(tmpPath, path)
+    except OSError:
+        pass
+
+def loadArray(path, typecode, length):
+    """
+    Memory-maps an array of length items of typecode written by saveArray,
+    and returns it as a read-only memoryview, or None if there is no usable
+    one.  The file is closed at once; the map holds its own descriptor until
+    the last view of it is released or freed.
+    """
+    itemSize = array.array(typecode).itemsize
+    try:
+        with open(path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size != length * itemSize or length == 0:
+                return None
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    return memoryview(mapped).cast(typecode)
+
+# Layouts whose tables and fields are kept
+DISTANCE_CACHE_SIZE = 4
+
+_tables = layoutCompiler.WallsCache(DISTANCE_CACHE_SIZE, DistanceTable.close)
+
+def getDistanceTable(walls, cacheDir=CACHE_DIR):
+    """
+    Returns the DistanceTable for walls.  The tables of the most recently
+    used layouts are cached, so asking again for the same layout is a
+    dictionary lookup; a table dropped from the cache is closed.
+    """
+    return _tables.get(walls, lambda: DistanceTable(walls, cacheDir))
+
+# Distance fields kept by a DistanceFields object
+FIELD_CACHE_SIZE = 64
+
+class DistanceFields:
+    """
+    Shortest path lengths from single sources, computed when they are asked
+    for.  A field holds the distance from its source to every open cell,
+    ordered like the cells of the CompiledLayout of the walls.
+
+    Without cellCosts every step costs 1 and fields are computed with a
+    breadth first search.  cellCosts[i] is otherwise the cost of stepping
+    into cell i (see CompiledLayout.cellCosts) and fields are computed with
+    Dijkstra's algorithm.  The cacheSize most recently used fields are kept.
+    """
+    def __init__(self, walls, cellCosts=None, cacheSize=FIELD_CACHE_SIZE):
+        self.layout = layoutCompiler.compileLayout(walls)
+        self.cells = self.layout.cells
+        self.index = self.layout.index
+        self.size = self.layout.size
+        self.cellCosts = cellCosts
+        self.typecode = 'l' if cellCosts is None else 'd'
+        self._fields = util.LRUCache(cacheSize)
+
+    def getDistance(self, pos1, pos2):
+        "Returns the maze distance between two open positions, or UNREACHABLE"
+        return self.getDistances(pos1)[self.index[pos2]]
+
+    def getDistances(self, pos):
+        "Returns the distance field of pos, ordered like self.cells"
+        source = self.index[pos]
+        field = self._fields.get(source)
+        if field is None:
+            if self.cellCosts is None:
+                field = self._breadthFirst(source)
+            else:
+                field = self._dijkstra(source)
+            self._fields[source] = field
+        return field
+
+    def batchDistances(self, source, targets):
+        "Returns an array with the distance from source to each position in targets"
+        return _batchDistances(self.getDistances(source), self.index, targets, self.typecode)
+
+    def pairDistances(self, pairs):
+        """
+        Returns an array with the distance of each (source, target) pair.
+        Pairs are grouped by source, so each distinct source costs at most
+        one search however many pairs share it.
+        """
+        return _pairDistances(self.getDistances, self.index, pairs, self.typecode)
+
+    def getPath(self, pos1, pos2):
+        """
+        Returns a cheapest list of actions from pos1 to pos2, or None if pos2
+        cannot be reached.  The path is traced back from pos2 through the
+        field of pos1, so after getDistances(pos1) it needs no search.
+        """
+        moves, costs = self.layout.moves, self.cellCosts
+        field = self.getDistances(pos1)
+        source, cell = self.index[pos1], self.index[pos2]
+        if field[cell] == UNREACHABLE:
+            return None
+        actions = []
+        while cell != source:
+            step = 1 if costs is None else costs[cell]
+            for neighbor, action in moves[cell]:
+                if field[neighbor] != UNREACHABLE and field[neighbor] + step == field[cell]:
+                    actions.append(Directions.REVERSE[action])
+                    cell = neighbor
+                    break
+        actions.reverse()
+        return actions
+
+    def _breadthFirst(self, source):
+        moves = self.layout.moves
+        field = array.array('l', [UNREACHABLE]) * self.size
+        field[source] = 0
+        fringe = collections.deque([source])
+        while fringe:
+            cell = fringe.popleft()
+            nextDistance = field[cell] + 1
+            for neighbor, action in moves[cell]:
+                if field[neighbor] == UNREACHABLE:
+                    field[neighbor] = nextDistance
+                    fringe.append(neighbor)
+        return field
+
+    def _dijkstra(self, source):
+        moves, costs = self.layout.moves, self.cellCosts
+        field = array.array('d', [UNREACHABLE]) * self.size
+        done = [False] * self.size
+        field[source] = 0
+        heap = [(0, source)]
+        while heap:
+            distance, cell = heapq.heappop(heap)
+            if done[cell]:
+                continue
+            done[cell] = True
+            for neighbor, action in moves[cell]:
+                if not done[neighbor]:
+                    nextDistance = distance + costs[neighbor]
+                    if field[neighbor] == UNREACHABLE or nextDistance < field[neighbor]:
+                        field[neighbor] = nextDistance
+                        heapq.heappush(heap, (nextDistance, neighbor))
+        return field
+
+def _batchDistances(field, index, targets, typecode):
+    return array.array(typecode, [field[index[target]] for target in targets])
+
+def _pairDistances(getDistances, index, pairs, typecode):
+    "Answers (source, target) pairs with one distance field per distinct source"
+    bySource = collections.defaultdict(list)
+    for i, (source, target) in enumerate(pairs):
+        bySource[source].append(i)
+    results = array.array(typecode, [UNREACHABLE]) * len(pairs)
+    for source, positions in bySource.items():
+        field = getDistances(source)
+        for i in positions:
+            results[i] = field[index[pairs[i][1]]]
+    return results
+
+_fields = layoutCompiler.WallsCache(DISTANCE_CACHE_SIZE)
+
+def getDistanceFields(walls):
+    """
+    Returns the unit cost DistanceFields for walls, cached like the tables
+    of getDistanceTable.
+    """
+    return _fields.get(walls, lambda: DistanceFields(walls))
+
+# Layouts with more open cells than this get a DistanceFields object from
+# getMazeDistances: a DistanceTable takes about a second to compute at this
+# size, and its time and memory grow with the square of it
+TABLE_CELL_LIMIT = 1500
+
+def getMazeDistances(walls):
+    """
+    Returns the DistanceTable of walls if the layout has at most
+    TABLE_CELL_LIMIT open cells, and its DistanceFields otherwise.  Both
+    answer getDistance, getDistances, batchDistances, pairDistances and
+    getPath, and index their distances like the cells of the layout.
+    """
+    if layoutCompiler.compileLayout(walls).size <= TABLE_CELL_LIMIT:
+        return getDistanceTable(walls)
+    return getDistanceFields(walls)
@@ -0,0 +1,200 @@
+# mazeGenerator.py
+# ----------------
+# Licensing Information:  You are free to use or extend these projects for
+# educational purposes provided that (1) you do not distribute or publish
+# solutions, (2) you retain this notice, and (3) you provide clear
+# attribution to UC Berkeley, including a link to http://ai.berkeley.edu.
+#
+# Attribution Information: The Pacman AI projects were developed at UC Berkeley.
+# The core projects and autograders were primarily created by John DeNero
+# (denero@cs.berkeley.edu) and Dan Klein (klein@cs.berkeley.edu).
+# Student side autograding was added by Brad Miller, Nick Hay, and
+# Pieter Abbeel (pabbeel@cs.berkeley.edu).
+
+
+"""
+Seeded generators for Pacman layouts, in the .lay text format read by
+layout.py.  The same kind, size and seed always give the same layout.
+
+  maze:   a perfect maze (one path between any two cells) carved by a
+          randomized depth first search, optionally with some walls knocked
+          out to make loops
+  rooms:  an open area split into rooms by recursive division, with one
+          doorway in every dividing wall
+  food:   a maze or rooms layout with food dots scattered over it
+
+Pacman starts in the top right corner and there is a dot at (1,1), the
+default goal of a PositionSearchProblem.  Widths and heights are rounded up
+to odd numbers, so the four corners used by CornersProblem are always open.
+All generators are iterative and handle layouts up to 1000x1000.
+
+> python mazeGenerator.py --kind maze --width 41 --height 21 --seed 3 --output myMaze.lay
+> python mazeGenerator.py --kind food --base rooms --width 15 --height 15 --food 8
+"""
+
+import random
+
+WALL, OPEN, FOOD, PACMAN = '%', ' ', '.', 'P'
+
+def _emptyGrid(width, height, fill):
+    "Returns a grid of characters, indexed grid[row][column], framed by walls"
+    grid = [[fill] * width for _ in range(height)]
+    for row in grid:
+        row[0] = row[-1] = WALL
+    grid[0] = [WALL] * width
+    grid[-1] = [WALL] * width
+    return grid
+
+def _oddSize(width, height):
+    if width < 5 or height < 5:
+        raise ValueError('Layouts must be at least 5x5, got %dx%d' % (width, height))
+    return width | 1, height | 1
+
+def generateMaze(width, height, seed=0, loops=0.0):
+    """
+    Returns the rows of a width x height maze.  Cells sit at odd rows and
+    columns; a randomized depth first search carves a passage into every
+    one.  Each wall between two passages is then removed with probability
+    loops, so loops=0 gives a perfect maze.
+    """
+    width, height = _oddSize(width, height)
+    rand = random.Random(seed)
+    grid = _emptyGrid(width, height, WALL)
+    cellsWide, cellsHigh = width // 2, height // 2
+
+    grid[1][1] = OPEN
+    visited = [[False] * cellsWide for _ in range(cellsHigh)]
+    visited[0][0] = True
+    stack = [(0, 0)]
+    while stack:
+        cx, cy = stack[-1]
+        unvisited = [(cx + dx, cy + dy) for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1))
+                     if 0 <= cx + dx < cellsWide and 0 <= cy + dy < cellsHigh and not visited[cy + dy][cx + dx]]
+        if not unvisited:
+            stack.pop()
+            continue
+        nx, ny = rand.choice(unvisited)
+        visited[ny][nx] = True
+        grid[2 * ny + 1][2 * nx + 1] = OPEN
+        grid[cy + ny + 1][cx + nx + 1] = OPEN
+        stack.append((nx, ny))
+
+    if loops > 0:
+        for row in range(1, height - 1):
+            for column in range(1, width - 1):
+                if grid[row][column] == WALL and rand.random() < loops and \
+                   ((grid[row][column - 1] == OPEN and grid[row][column + 1] == OPEN) or
+                    (grid[row - 1][column] == OPEN and grid[row + 1][column] == OPEN)):
+                    grid[row][column] = OPEN
+    return _finish(grid)
+
+def generateRooms(width, height, seed=0, minRoomSize=4):
+    """
+    Returns the rows of a width x height layout of rooms.  The open area is
+    split by a wall with one doorway, and each side is split again, until
+    the rooms are smaller than minRoomSize in both directions.  Walls run
+    along even rows and columns and doorways sit at odd ones, so doorways
+    are never blocked by a later wall.
+    """
+    width, height = _oddSize(width, height)
+    rand = random.Random(seed)
+    grid = _emptyGrid(width, height, OPEN)
+
+    # rooms as (left, top, right, bottom) interior bounds, all odd
+    rooms = [(1, 1, width - 2, height - 2)]
+    while rooms:
+        left, top, right, bottom = rooms.pop()
+        roomWidth, roomHeight = right - left + 1, bottom - top + 1
+        if max(roomWidth, roomHeight) < 2 * minRoomSize + 1:
+            continue
+        if roomWidth > roomHeight or (roomWidth == roomHeight and rand.random() < 0.5):
+            column = rand.randrange(left + minRoomSize, right - minRoomSize + 1) & ~1
+            if column <= left or column >= right:
+                continue
+            for row in range(top, bottom + 1):
+                grid[row][column] = WALL
+            grid[rand.randrange(top, bottom + 1) | 1][column] = OPEN
+            rooms.append((left, top, column - 1, bottom))
+            rooms.append((column + 1, top, right, bottom))
+        else:
+            row = rand.randrange(top + minRoomSize, bottom - minRoomSize + 1) & ~1
+            if row <= top or row >= bottom:
+                continue
+            for column in range(left, right + 1):
+                grid[row][column] = WALL
+            grid[row][rand.randrange(left, right + 1) | 1] = OPEN
+            rooms.append((left, top, right, row - 1))
+            rooms.append((left, row + 1, right, bottom))
+    return _finish(grid)
+
+def generateFood(width, height, seed=0, food=10, base='maze', loops=0.1):
+    """
+    Returns the rows of a maze or rooms layout (base) with food dots on food
+    distinct open cells, one of them at (1,1).
+    """
+    if base == 'maze':
+        rows = generateMaze(width, height, seed, loops)
+    elif base == 'rooms':
+        rows = generateRooms(width, height, seed)
+    else:
+        raise ValueError('Unknown base layout kind: ' + base)
+    grid = [list(row) for row in rows]
+    rand = random.Random(seed + 1)
+    openCells = [(row, column) for row in range(len(grid)) for column in range(len(grid[0]))
+                 if grid[row][column] == OPEN]
+    for row, column in rand.sample(openCells, min(max(food - 1, 0), len(openCells))):
+        grid[row][column] = FOOD
+    return [''.join(row) for row in grid]
+
+def _finish(grid):
+    "Places Pacman in the top right corner and a dot at (1,1), which is the bottom left"
+    grid[1][-2] = PACMAN
+    grid[-2][1] = FOOD
+    return [''.join(row) for row in grid]
+
+GENERATORS = {
+    'maze': lambda options: generateMaze(options.width, options.height, options.seed, options.loops),
+    'rooms': lambda options: generateRooms(options.width, options.height, options.seed),
+    'food': lambda options: generateFood(options.width, options.height, options.seed, options.food,
+                                         options.base, options.loops),
+}
+
+def layoutText(rows):
+    "Returns the rows of a layout as the contents of a .lay file"
+    return '\n'.join(rows) + '\n'
+
+def readCommand(argv):
+    from optparse import OptionParser
+    parser = OptionParser(usage=__doc__)
+    parser.add_option('--kind', dest='kind', default='maze',
+                      help='one of %s (default %%default)' % ', '.join(sorted(GENERATORS)))
+    parser.add_option('--width', dest='width', type='int', default=21,
+                      help='layout width, 5 to 1000, rounded up to odd (default %default)')
+    parser.add_option('--height', dest='height', type='int', default=21,
+                      help='layout height, 5 to 1000, rounded up to odd (default %default)')
+    parser.add_option('--seed', dest='seed', type='int', default=0,
+                      help='random seed (default %default)')
+    parser.add_option('--loops', dest='loops', type='float', default=0.0,
+                      help='probability of removing a maze wall between two passages (default %default)')
+    parser.add_option('--food', dest='food', type='int', default=10,
+                      help='number of food dots for --kind food (default %default)')
+    parser.add_option('--base', dest='base', default='maze',
+                      help='layout under the food for --kind food: maze or rooms (default %default)')
+    parser.add_option('--output', dest='output', default=None,
+                      help='file to write the layout to (default: print it)')
+    options, otherjunk = parser.parse_args(argv)
+    if len(otherjunk) != 0:
+        raise Exception('Command line input not understood: ' + str(otherjunk))
+    if options.kind not in GENERATORS:
+        raise Exception('Unknown layout kind: ' + options.kind)
+    return options
+
+if __name__ == '__main__':
+    import sys
+    options = readCommand(sys.argv[1:])
+    text = layoutText(GENERATORS[options.kind](options))
+    if options.output:
+        with open(options.output, 'w') as f:
+            f.write(text)
+    else:
+        sys.stdout.write(text)
@@ -0,0 +1,133 @@
+# patternDatabase.py
+# ------------------
+# Licensing Information:  You are free to use or extend these projects for
+# educational purposes provided that (1) you do not distribute or publish
+# solutions, (2) you retain this notice, and (3) you provide clear
+# attribution to UC Berkeley, including a link to http://ai.berkeley.edu.
+#
+# Attribution Information: The Pacman AI projects were developed at UC Berkeley.
+# The core projects and autograders were primarily created by John DeNero
+# (denero@cs.berkeley.edu) and Dan Klein (klein@cs.berkeley.edu).
+# Student side autograding was added by Brad Miller, Nick Hay, and
+# Pieter Abbeel (pabbeel@cs.berkeley.edu).
+
+
+"""
+Pattern databases for the FoodSearchProblem.
+
+The food of a layout is split into groups of at most maxGroupSize dots.
+For each group, the abstraction that ignores every other dot is solved
+exactly: for every open cell and every subset of the group still uneaten,
+the table holds the length of the shortest walk from the cell that eats the
+whole subset.  The tables are solved backward, from the empty subset up, as
+  cost(cell, S) = min over dots f in S of  dist(cell, f) + cost(f, S - f)
+over the distance fields of the dots (see mazeDistances.getMazeDistances),
+and are stored as arrays of unsigned 16 bit integers, indexed
+cell << groupSize | subset.
+
+Each group's cost is a lower bound on the real cost and is consistent, so
+their maximum is too.  Their sum is not: one step can bring Pacman closer to
+dots of two groups at once.  Tables are saved in mazeDistances.CACHE_DIR
+under a hash of the walls and the group's dots, so later games on the same
+layout load them instead of solving them again.
+
+Usage:
+  pdb = getFoodPatternDatabase(problem.walls, problem.foodPositions)
+  pdb.getValue(position, foodMask)
+"""
+
+import array
+import hashlib
+import os
+import layoutCompiler
+import mazeDistances
+
+# Dots per group; a group's table has (open cells) * 2^size entries
+MAX_GROUP_SIZE = 10
+
+# The largest value a table stores; larger costs are clamped, which keeps
+# the tables admissible
+MAX_VALUE = 65535
+
+class FoodPatternDatabase:
+    """
+    Exact costs of eating groups of the food of a layout.
+
+    Group g covers the dots foodPositions[offset:offset + size], so its
+    subset of a FoodSearchProblem food mask is (foodMask >> offset) & (2^size - 1).
+    """
+    def __init__(self, walls, foodPositions, maxGroupSize=MAX_GROUP_SIZE, cacheDir=mazeDistances.CACHE_DIR):
+        self.distances = mazeDistances.getMazeDistances(walls)
+        self.index = self.distances.index
+        self.groups = []    # (offset, size, table)
+
+        count = len(foodPositions)
+        groupCount = max(1, -(-count // maxGroupSize))
+        wallsKey = layoutCompiler.wallsKey(walls)
+        offset = 0
+        for g in range(groupCount):
+            # spread the dots evenly over the groups
+            size = count // groupCount + (1 if g < count % groupCount else 0)
+            foods = foodPositions[offset:offset + size]
+            self.groups.append((offset, size, self._loadOrBuild(wallsKey, foods, cacheDir)))
+            offset += size
+
+    def getValue(self, position, foodMask):
+        "Returns the largest cost, over the groups, of eating the group's dots in foodMask"
+        cell = self.index[position]
+        best = 0
+        for offset, size, table in self.groups:
+            value = table[cell << size | (foodMask >> offset) & ((1 << size) - 1)]
+            if value > best:
+                best = value
+        return best
+
+    def _loadOrBuild(self, wallsKey, foods, cacheDir):
+        path = None
+        if cacheDir is not None:
+            key = hashlib.sha1((wallsKey + repr(list(foods))).encode()).hexdigest()
+            path = os.path.join(cacheDir, key + '.pdb')
+            table = mazeDistances.loadArray(path, 'H', self.distances.size << len(foods))
+            if table is not None:
+                return table
+        table = buildGroupTable(self.distances, foods)
+        if path is not None:
+            mazeDistances.saveArray(path, table)
+        return table
+
+def buildGroupTable(distances, foods):
+    """
+    Solves the abstraction of one group of dots and returns its table: the
+    entry for cell << len(foods) | subset is the shortest walk from the cell
+    that eats the dots of subset.  distances is a DistanceTable or
+    DistanceFields of the layout.
+    """
+    size, k = distances.size, len(foods)
+    subsets = 1 << k
+    infinity = MAX_VALUE
+    foodCells = [distances.index[food] for food in foods]
+    rows = [[infinity if d == mazeDistances.UNREACHABLE else d for d in distances.getDistances(food)]
+            for food in foods]
+
+    table = array.array('H', [0]) * (size * subsets)
+    # every subset is solved after the subsets it contains
+    for subset in range(1, subsets):
+        candidates = []
+        for i in range(k):
+            if subset >> i & 1:
+                rest = table[foodCells[i] * subsets + (subset ^ (1 << i))]
+                candidates.append([d + rest for d in rows[i]])
+        column = [min(values) for values in zip(*candidates)] if len(candidates) > 1 else candidates[0]
+        table[subset::subsets] = array.array('H', [min(value, infinity) for value in column])
+    return table
+
+_databases = layoutCompiler.WallsCache()
+
+def getFoodPatternDatabase(walls, foodPositions, maxGroupSize=MAX_GROUP_SIZE):
+    """
+    Returns the FoodPatternDatabase for walls and foodPositions.  The
+    databases of recently used layouts are cached like the tables of
+    mazeDistances.getDistanceTable.
+    """
+    return _databases.get(walls, lambda: FoodPatternDatabase(walls, foodPositions, maxGroupSize),
+                          tuple(foodPositions), maxGroupSize)
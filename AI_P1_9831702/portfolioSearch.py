@@ -0,0 +1,132 @@
+# portfolioSearch.py
+# ------------------
+# Licensing Information:  You are free to use or extend these projects for
+# educational purposes provided that (1) you do not distribute or publish
+# solutions, (2) you retain this notice, and (3) you provide clear
+# attribution to UC Berkeley, including a link to http://ai.berkeley.edu.
+#
+# Attribution Information: The Pacman AI projects were developed at UC Berkeley.
+# The core projects and autograders were primarily created by John DeNero
+# (denero@cs.berkeley.edu) and Dan Klein (klein@cs.berkeley.edu).
+# Student side autograding was added by Brad Miller, Nick Hay, and
+# Pieter Abbeel (pabbeel@cs.berkeley.edu).
+
+
+"""
+Portfolio search: several (search function, heuristic) pairs race on the
+same problem, each in its own process.
+
+The first path returned by a member that is guaranteed to be optimal wins
+and the other members are stopped.  A path from a member that is not
+optimal (dfs) is only used if every optimal member fails, or if there are
+no optimal members at all.  The statistics of every member (see
+searchStats.py) can be appended to a JSON lines log keyed by the layout, to
+learn which configuration is fastest on which kind of layout.
+
+From the command line, members are separated by + and a member's heuristic
+follows a colon:
+
+> python pacman.py -l trickySearch -p SearchAgent -a prob=FoodSearchProblem,portfolio=astar:foodHeuristic+ucs+ids:foodHeuristic,portfolioLog=portfolio.json
+"""
+
+import json
+import multiprocessing
+import queue
+import time
+import layoutCompiler
+import searchStats
+
+# Search functions that return a least cost path, given an admissible
+# heuristic (and unit step costs for bfs, bibfs and jps)
+OPTIMAL_SEARCHES = set(['bfs', 'breadthFirstSearch', 'ucs', 'uniformCostSearch', 'astar', 'aStarSearch',
+                        'ids', 'iterativeDeepeningSearch', 'bibfs', 'bidirectionalBreadthFirstSearch',
+                        'biastar', 'bidirectionalAStarSearch', 'jps', 'jumpPointSearch'])
+
+class PortfolioMember:
+    "A search function, and its heuristic or None, to run in a portfolio"
+    def __init__(self, name, function, heuristic=None, heuristicName=None):
+        self.name = name
+        self.function = function
+        self.heuristic = heuristic
+        self.label = name if heuristicName is None else '%s:%s' % (name, heuristicName)
+        self.optimal = name in OPTIMAL_SEARCHES
+
+def _runMember(index, member, searchType, gameState, results):
+    "Runs one member in a worker process and puts (index, actions, stats, error) on results"
+    try:
+        problem = searchType(gameState)
+        stats = searchStats.SearchStats(member.label, searchType.__name__)
+        problem.searchStats = stats
+        if member.heuristic is None:
+            actions = member.function(problem)
+        else:
+            actions = member.function(problem, heuristic=member.heuristic)
+        results.put((index, actions, stats.asDict(), None))
+    except Exception as e:
+        results.put((index, None, None, repr(e)))
+
+def runPortfolio(members, searchType, gameState, timeout=None, logPath=None):
+    """
+    Races the members on searchType(gameState) and returns (actions, record).
+    actions is None if no member found a path within timeout seconds.
+    record describes the race: the layout, the winner, and the status
+    (won, lost, noPath, failed or cancelled), time and statistics of every
+    member.  If logPath is given, record is appended to it as a JSON line.
+    """
+    acceptAny = not any(member.optimal for member in members)
+    results = multiprocessing.Queue()
+    processes = []
+    start = time.perf_counter()
+    for index, member in enumerate(members):
+        process = multiprocessing.Process(target=_runMember, args=(index, member, searchType, gameState, results))
+        process.daemon = True
+        process.start()
+        processes.append(process)
+
+    outcomes = [None] * len(members)
+    winner, fallback = None, None
+    pending = len(members)
+    while pending and winner is None:
+        wait = None
+        if timeout is not None:
+            wait = max(0, timeout - (time.perf_counter() - start))
+        try:
+            index, actions, stats, error = results.get(timeout=wait)
+        except queue.Empty:
+            break
+        pending -= 1
+        outcomes[index] = {'seconds': time.perf_counter() - start, 'stats': stats, 'error': error}
+        if actions is None:
+            outcomes[index]['status'] = 'noPath' if error is None else 'failed'
+        elif members[index].optimal or acceptAny:
+            winner = (index, actions)
+        elif fallback is None:
+            fallback = (index, actions)
+
+    for process in processes:
+        if process.is_alive():
+            process.terminate()
+        process.join()
+
+    if winner is None:
+        winner = fallback
+    record = {
+        'layout': layoutCompiler.wallsKey(gameState.getWalls()),
+        'width': gameState.getWalls().width,
+        'height': gameState.getWalls().height,
+        'food': gameState.getNumFood(),
+        'problem': searchType.__name__,
+        'winner': None if winner is None else members[winner[0]].label,
+        'members': [],
+    }
+    for index, member in enumerate(members):
+        outcome = outcomes[index] or {'seconds': time.perf_counter() - start, 'stats': None, 'error': None, 'status': 'cancelled'}
+        if 'status' not in outcome:
+            outcome['status'] = 'won' if winner is not None and winner[0] == index else 'lost'
+        outcome.update({'member': member.label, 'optimal': member.optimal})
+        record['members'].append(outcome)
+
+    if logPath:
+        with open(logPath, 'a') as f:
+            f.write(json.dumps(record) + '\n')
+    return (None if winner is None else winner[1]), record
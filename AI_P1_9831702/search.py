@@ -18,6 +18,8 @@ Pacman agents (in searchAgents.py).
 """
 
 import util
+import heapq
+import time
 
 class SearchProblem:
     """
@@ -62,6 +64,53 @@ class SearchProblem:
         util.raiseNotDefined()
 
 
+class SearchNode:
+    """
+    A node in the search tree built by the graph search algorithms below.
+
+    Instead of carrying its whole list of actions, a node only remembers the
+    state it reached, the node it was expanded from (its parent), the action
+    taken from the parent and the total path cost so far.  Pushing a
+    successor is therefore constant time and memory, and the list of actions
+    is rebuilt once, by path(), when a goal node is popped.
+    """
+    __slots__ = ('state', 'parent', 'action', 'cost')
+
+    def __init__(self, state, parent=None, action=None, cost=0):
+        self.state = state
+        self.parent = parent
+        self.action = action
+        self.cost = cost
+
+    def path(self):
+        "Returns the list of actions that leads from the start node to this node"
+        actions = []
+        node = self
+        while node.parent is not None:
+            actions.append(node.action)
+            node = node.parent
+        actions.reverse()
+        return actions
+
+
+def _beginStats(problem, heuristic=None):
+    """
+    Returns the SearchStats attached to problem as problem.searchStats (see
+    searchStats.py), or None if there is none, and the heuristic the search
+    should call.  Searches without stats run unwrapped.
+    """
+    stats = getattr(problem, 'searchStats', None)
+    if stats is not None:
+        heuristic = stats.begin(problem, heuristic)
+    return stats, heuristic
+
+def _endStats(stats, actions):
+    "Reports the end of a search to its stats and returns actions"
+    if stats is not None:
+        stats.end(actions)
+    return actions
+
+
 def tinyMazeSearch(problem):
     """
     Returns a sequence of moves that solves tinyMaze.  For any other maze, the
@@ -87,143 +136,708 @@ def depthFirstSearch(problem):
     print("Start's successors:", problem.getSuccessors(problem.getStartState()))
     """
     "*** YOUR CODE HERE ***"
+    stats, _ = _beginStats(problem)
     fringe = util.Stack()
     explored = set()
 
-    fringe.push((problem.getStartState(), []))
+    fringe.push(SearchNode(problem.getStartState()))
 
     while not fringe.isEmpty():
-        # state: location, actions: path
-        state, actions = fringe.pop()
+        node = fringe.pop()
+        state = node.state
         explored.add(state) 
 
         if problem.isGoalState(state):
-            return actions
+            return _endStats(stats, node.path())
 
         for s, a, c in problem.getSuccessors(state):
             if s not in explored:
-                fringe.push((s, actions + [a]))
-    return None
+                fringe.push(SearchNode(s, node, a, node.cost + c))
+        if stats is not None:
+            stats.sample(len(fringe), len(explored))
+    return _endStats(stats, None)
 
 def breadthFirstSearch(problem):
     """Search the shallowest nodes in the search tree first."""
     "*** YOUR CODE HERE ***"
+    stats, _ = _beginStats(problem)
     fringe = util.Queue()
     explored = set()
 
 
-    fringe.push((problem.getStartState(), []))
+    fringe.push(SearchNode(problem.getStartState()))
     explored.add(problem.getStartState())
 
     while not fringe.isEmpty():
-        # state: location, actions: path
-        state, actions = fringe.pop()
+        node = fringe.pop()
+        state = node.state
 
         if problem.isGoalState(state):
-            return actions
+            return _endStats(stats, node.path())
 
         for s, a, c in problem.getSuccessors(state):
             if s not in explored:
-                fringe.push((s, actions + [a]))
+                fringe.push(SearchNode(s, node, a, node.cost + c))
                 explored.add(s)
+        if stats is not None:
+            stats.sample(len(fringe), len(explored))
 
-    return None
+    return _endStats(stats, None)
 
 def uniformCostSearch(problem):
     """Search the node of least total cost first."""
     "*** YOUR CODE HERE ***"
-    # the fringe apart from the state , action, cost also has priority 0
-    # which is same as the cost as we want the least total cost first
+    # the fringe holds each frontier state once, prioritized by its path
+    # cost as we want the least total cost first.  A cheaper path to a
+    # queued state lowers its priority (decrease-key) instead of pushing a
+    # duplicate entry; the best node found so far is kept in nodes.
+    stats, _ = _beginStats(problem)
 
-    fringe = util.PriorityQueue()
+    fringe = util.IndexedPriorityQueue()
     explored = set()
 
-    fringe.push((problem.getStartState(), [], 0), 0)
+    start = problem.getStartState()
+    nodes = {start: SearchNode(start)}
+    fringe.push(start, 0)
     while not fringe.isEmpty():
-        # state: location, actions: path
-        state, actions, cost = fringe.pop()
+        state = fringe.pop()
+        node = nodes.pop(state)
 
         if problem.isGoalState(state):
-            return actions
+            return _endStats(stats, node.path())
 
-        if state not in explored:   
-            explored.add(state)     
-            for s, a, c in problem.getSuccessors(state):
-                if s not in explored:
-                    fringe.push((s, actions + [a], cost + c), cost + c)
+        explored.add(state)
+        for s, a, c in problem.getSuccessors(state):
+            if s not in explored:
+                cost = node.cost + c
+                if fringe.update(s, cost):
+                    nodes[s] = SearchNode(s, node, a, cost)
+        if stats is not None:
+            stats.sample(len(fringe), len(explored))
 
-    return None
+    return _endStats(stats, None)
 
 def nullHeuristic(state, problem=None):
     """
     A heuristic function estimates the cost from the current state to the nearest
     goal in the provided SearchProblem.  This heuristic is trivial.
+
+    A heuristic may also have a batch attribute: a function from a list of
+    states and the problem to the list of their estimates.  aStarSearch then
+    makes one batch call for the new successors of a node instead of one
+    call per successor.  This only pays off for heuristics with a large
+    fixed cost per call; the heuristics in searchAgents.py are cheaper to
+    call one state at a time.
     """
     return 0
 
 def aStarSearch(problem, heuristic=nullHeuristic):
     """Search the node that has the lowest combined cost and heuristic first."""
     "*** YOUR CODE HERE ***"
-    # the fringe apart from the state , action, cost also has priority 0 
-    # which is same as the cost as we want the least total cost first
-
-    fringe = util.PriorityQueue()
+    # the fringe holds each frontier state once, prioritized by its path
+    # cost plus the heuristic estimate of the remaining cost.  A cheaper
+    # path to a queued state lowers its priority (decrease-key) instead of
+    # pushing a duplicate entry; the best node found so far is kept in nodes.
+    # The estimate of each queued state is kept too, so the heuristic is
+    # called once per state: a cheaper path to a queued state reuses it.
+    stats, heuristic = _beginStats(problem, heuristic)
+    batch = getattr(heuristic, 'batch', None)
+
+    fringe = util.IndexedPriorityQueue()
     explored = set()
 
-    fringe.push((problem.getStartState(), [], 0), 0)
+    start = problem.getStartState()
+    nodes = {start: SearchNode(start)}
+    estimates = {}
+    fringe.push(start, 0)
     while not fringe.isEmpty():
-        # state: location, actions: path
-        state, actions, cost = fringe.pop()
+        state = fringe.pop()
+        node = nodes.pop(state)
+        estimates.pop(state, None)
 
         if problem.isGoalState(state):
-            return actions
-
-        if state not in explored:
-            explored.add(state)
-            for s, a, c in problem.getSuccessors(state):
-                if s not in explored:
-                    fringe.push((s, actions + [a], cost + c), cost + c + heuristic(s, problem))
-
-    return None
-
-def iterativeDeepeningSearch(problem):
-    """This function is for the first of the grad students questions"""
+            return _endStats(stats, node.path())
+
+        explored.add(state)
+        successors = problem.getSuccessors(state)
+        if batch is not None:
+            fresh = [s for s, a, c in successors if s not in explored and s not in nodes]
+            if fresh:
+                estimates.update(zip(fresh, batch(fresh, problem)))
+        for s, a, c in successors:
+            if s not in explored:
+                cost = node.cost + c
+                queued = nodes.get(s)
+                if queued is None:
+                    h = estimates.get(s)
+                    if h is None:
+                        h = estimates[s] = heuristic(s, problem)
+                elif cost < queued.cost:
+                    h = estimates[s]
+                else:
+                    # the same estimate on a costlier path cannot lower the priority
+                    continue
+                fringe.push(s, cost + h)
+                nodes[s] = SearchNode(s, node, a, cost)
+        if stats is not None:
+            stats.sample(len(fringe), len(explored))
+
+    return _endStats(stats, None)
+
+def iterativeDeepeningSearch(problem, heuristic=nullHeuristic, costLimit=None, tableSize=100000):
+    """
+    Iterative deepening A* (IDA*).
+
+    Runs depth first searches that cut off every node whose f = g + h is
+    above a cost bound.  The first bound is h(start); each following search
+    raises it to the smallest f that was cut off.  With an admissible
+    heuristic the first goal found is therefore optimal, and with the
+    default nullHeuristic this is plain iterative deepening on path cost.
+
+    Only the current path is kept in memory, and cycles are checked against
+    it alone.  A transposition table of at most tableSize states remembers,
+    across iterations, the cheapest g (and so f) each state was reached with.
+    A state reached again at a higher cost is pruned, and so is one already
+    explored at the same cost in the current iteration.  Returns None if
+    there is no solution, or none costing at most costLimit.
+    """
     "*** MY CODE HERE ***"
-    from game import Directions
+    stats, heuristic = _beginStats(problem, heuristic)
+    start = problem.getStartState()
+    if problem.isGoalState(start):
+        return _endStats(stats, [])
+
+    # state -> [cheapest g seen, last iteration it was explored with that g]
+    transpositions = {start: [0, 0]}
+    bound = heuristic(start, problem)
+    iteration = 0
+    while costLimit is None or bound <= costLimit:
+        iteration += 1
+        nextBound = float('inf')
+
+        # depth first search, one (node, remaining successors) per path step
+        root = SearchNode(start)
+        stack = [(root, iter(problem.getSuccessors(start)))]
+        onPath = {start}
+        while stack:
+            node, successors = stack[-1]
+            for s, a, c in successors:
+                if s in onPath:
+                    continue
+                g = node.cost + c
+                entry = transpositions.get(s)
+                if entry is not None and (g > entry[0] or (g == entry[0] and entry[1] == iteration)):
+                    continue
+                f = g + heuristic(s, problem)
+                if f > bound:
+                    if f < nextBound:
+                        nextBound = f
+                    continue
+
+                child = SearchNode(s, node, a, g)
+                if problem.isGoalState(s):
+                    return _endStats(stats, child.path())
+                if entry is not None:
+                    entry[0], entry[1] = g, iteration
+                elif len(transpositions) < tableSize:
+                    transpositions[s] = [g, iteration]
+                onPath.add(s)
+                stack.append((child, iter(problem.getSuccessors(s))))
+                if stats is not None:
+                    stats.sample(len(stack), len(transpositions))
+                break
+            else:
+                # every successor of node has been tried, backtrack
+                stack.pop()
+                onPath.discard(node.state)
 
-    #initialization
-    fringe = util.Stack()
-    limit = 1
+        if stats is not None:
+            stats.extra['iterations'] = iteration
+        if nextBound == float('inf'):
+            return _endStats(stats, None)
+        bound = nextBound
+    return _endStats(stats, None)
 
-    while limit <= 100: # repeat search with the depth increases until we find the goal
-        explored = []
 
-        #### DFS ####
-        # push the starting point into stack
-        fringe.push((problem.getStartState(),[],0))
-        (state, actions, cost) = fringe.pop()
-        explored.append(state)
+def anytimeRepairingAStarSearch(problem, heuristic=nullHeuristic, timeLimit=None, initialWeight=3.0, weightStep=0.5):
+    """
+    Anytime Repairing A* (ARA*).
+
+    Starts as weighted A*, ordering the fringe by g + weight * h with an
+    inflated weight, which usually finds a first path after few expansions.
+    The weight is then lowered by weightStep at a time, down to 1, and each
+    round improves the best path so far.  A round reuses the previous
+    rounds' search: it only re-expands states whose path cost dropped after
+    they were expanded.  Goals are tested when states are generated, so an
+    improved path is noticed as soon as it is found.
+
+    With timeLimit (in seconds) the search returns the best path found once
+    the time is up; it keeps going past the limit only while it has no path
+    at all.  problem._suboptimalityBound is set to a factor the returned
+    path's cost is known to be within of the optimal cost, given a
+    consistent heuristic; it is 1 when the path is optimal.
+    """
+    stats, heuristic = _beginStats(problem, heuristic)
+    deadline = None if timeLimit is None else time.perf_counter() + timeLimit
+
+    start = problem.getStartState()
+    nodes = {start: SearchNode(start)}      # state -> node with its cheapest known path
+    estimates = {start: heuristic(start, problem)}
+    incumbent = nodes[start] if problem.isGoalState(start) else None
+    weight = max(initialWeight, 1.0)
+    fringe = util.IndexedPriorityQueue()
+    fringe.push(start, weight * estimates[start])
+    inconsistent = set()    # expanded states whose cost dropped since
+
+    while True:
+        closed = set()
+        while not fringe.isEmpty() and (incumbent is None or incumbent.cost > fringe.peekPriority()):
+            if deadline is not None and incumbent is not None and time.perf_counter() > deadline:
+                break
+            state = fringe.pop()
+            closed.add(state)
+            node = nodes[state]
+            for s, a, c in problem.getSuccessors(state):
+                cost = node.cost + c
+                old = nodes.get(s)
+                if old is not None and old.cost <= cost:
+                    continue
+                child = nodes[s] = SearchNode(s, node, a, cost)
+                if old is None:
+                    estimates[s] = heuristic(s, problem)
+                if (incumbent is None or cost < incumbent.cost) and problem.isGoalState(s):
+                    incumbent = child
+                if s in closed:
+                    inconsistent.add(s)
+                else:
+                    fringe.push(s, cost + weight * estimates[s])
+            if stats is not None:
+                stats.sample(len(fringe) + len(inconsistent), len(closed))
+
+        if incumbent is None:
+            return _endStats(stats, None)
+
+        # no unexpanded path can cost less than the lowest g + h left
+        lowest = min([nodes[s].cost + estimates[s] for s in fringe] +
+                     [nodes[s].cost + estimates[s] for s in inconsistent] + [incumbent.cost])
+        if lowest >= incumbent.cost:
+            # nothing left can beat the incumbent: the open list is empty,
+            # or the start is a goal and the path costs nothing
+            bound = 1.0
+        elif lowest <= 0:
+            bound = weight
+        else:
+            bound = min(weight, incumbent.cost / lowest)
+        problem._suboptimalityBound = max(bound, 1.0)
+        if stats is not None:
+            stats.extra['suboptimalityBound'] = problem._suboptimalityBound
+        if bound <= 1 or (deadline is not None and time.perf_counter() > deadline):
+            return _endStats(stats, incumbent.path())
+
+        weight = max(1.0, weight - weightStep)
+        queued = list(fringe) + list(inconsistent)
+        fringe = util.IndexedPriorityQueue()
+        for s in queued:
+            fringe.push(s, nodes[s].cost + weight * estimates[s])
+        inconsistent = set()
+
+
+class ReversedGoalProblem:
+    """
+    Wraps a search problem so that it looks like its goal is another state.
 
-        while not problem.isGoalState(state): # while we do not find the goal point
-            successors = problem.getSuccessors(state) # get the point's succesors
-            for s, a, c in successors:
-                new_cost = cost + c
-                # add the points when it meets 1. not been visited 2. within the depth 
-                if (not s in explored) and (new_cost <= limit): 
-                    fringe.push((s, actions + [a], new_cost)) 
-                    explored.append(s) # add this point to visited list
+    Heuristics estimate the cost to problem.goal; the backward half of a
+    bidirectional search needs the cost to the start state instead, so it
+    calls heuristic(state, ReversedGoalProblem(problem, start)).  Every other
+    attribute is read from the wrapped problem.
+    """
+    def __init__(self, problem, goal):
+        self.problem = problem
+        self.goal = goal
+
+    def __getattr__(self, name):
+        return getattr(self.problem, name)
 
-            if fringe.isEmpty(): # if the no goal is found within the current depth, jump out and increase the depth
+class IncrementalSearch:
+    """
+    D* Lite: a search that repairs its answer when step costs change or the
+    start moves, instead of searching again from scratch.
+
+    The search runs backward from problem.goal, so the problem needs
+    problem.goal and getPredecessors (as for bidirectionalBreadthFirstSearch).
+    For every state it keeps g, its cost to the goal when it was last
+    expanded, and rhs, the cost implied by its successors' g values; the
+    states where the two differ are on the fringe.  plan() expands fringe
+    states until the start is settled and returns a least cost path from it.
+
+    Between calls to plan(), notifyChanged(states) reports states whose
+    incoming or outgoing step costs changed (a cost of float('inf') blocks a
+    move), and moveStart(state) moves the start after the agent has taken a
+    step.  Only the states those changes affect are put back on the fringe,
+    so the next plan() costs about as much as the change, not the map.
+
+    The heuristic is evaluated with a ReversedGoalProblem whose goal is the
+    current start, so like for bidirectionalAStarSearch it must be
+    consistent towards the start (manhattanHeuristic is).
+    """
+    def __init__(self, problem, heuristic=nullHeuristic):
+        self.problem = problem
+        self.heuristic = heuristic
+        self.goal = problem.goal
+        self.start = problem.getStartState()
+        self.km = 0             # heuristic drift since the queue keys were computed
+        self.g = {}
+        self.rhs = {self.goal: 0}
+        self.fringe = util.IndexedPriorityQueue()
+        self._startProblem = ReversedGoalProblem(problem, self.start)
+        self._activeHeuristic = heuristic
+        self.fringe.push(self.goal, self._key(self.goal))
+
+    def plan(self):
+        "Returns a least cost list of actions from the start to the goal, or None"
+        problem = self.problem
+        stats, self._activeHeuristic = _beginStats(problem, self.heuristic)
+        inf = float('inf')
+        fringe, g, rhs, start = self.fringe, self.g, self.rhs, self.start
+
+        while not fringe.isEmpty():
+            if fringe.peekPriority() >= self._key(start) and rhs.get(start, inf) == g.get(start, inf):
                 break
+            oldKey = fringe.peekPriority()
+            state = fringe.pop()
+            newKey = self._key(state)
+            if oldKey < newKey:
+                # the start moved since the key was computed
+                fringe.push(state, newKey)
+            elif g.get(state, inf) > rhs.get(state, inf):
+                g[state] = rhs[state]
+                for p, a, c in problem.getPredecessors(state):
+                    self._update(p)
+            else:
+                g[state] = inf
+                self._update(state)
+                for p, a, c in problem.getPredecessors(state):
+                    self._update(p)
+            if stats is not None:
+                stats.sample(len(fringe), len(g))
+
+        actions = self._path()
+        self._activeHeuristic = self.heuristic
+        return _endStats(stats, actions)
+
+    def moveStart(self, state):
+        "Moves the start to state, typically the state the agent stepped into"
+        self.km += self.heuristic(self.start, ReversedGoalProblem(self.problem, state))
+        self.start = state
+        self._startProblem = ReversedGoalProblem(self.problem, state)
+
+    def notifyChanged(self, states):
+        "Reports states whose incoming or outgoing step costs have changed"
+        for state in states:
+            self._update(state)
+            for p, a, c in self.problem.getPredecessors(state):
+                self._update(p)
+
+    def _key(self, state):
+        inf = float('inf')
+        best = min(self.g.get(state, inf), self.rhs.get(state, inf))
+        return (best + self._activeHeuristic(state, self._startProblem) + self.km, best)
+
+    def _update(self, state):
+        "Recomputes the rhs of state and puts it on the fringe if it is inconsistent"
+        inf = float('inf')
+        if state != self.goal:
+            g = self.g
+            best = inf
+            for s, a, c in self.problem.getSuccessors(state):
+                cost = c + g.get(s, inf)
+                if cost < best:
+                    best = cost
+            self.rhs[state] = best
+        if state in self.fringe:
+            self.fringe.remove(state)
+        if self.g.get(state, inf) != self.rhs.get(state, inf):
+            self.fringe.push(state, self._key(state))
+
+    def _path(self):
+        "Follows the cheapest successor from the start down to the goal"
+        inf = float('inf')
+        g = self.g
+        if g.get(self.start, inf) == inf:
+            return None
+        actions = []
+        state = self.start
+        seen = set([state])
+        while state != self.goal:
+            best, bestMove = inf, None
+            for s, a, c in self.problem.getSuccessors(state):
+                cost = c + g.get(s, inf)
+                if cost < best:
+                    best, bestMove = cost, (s, a)
+            if bestMove is None or bestMove[0] in seen:
+                return None
+            state, action = bestMove
+            seen.add(state)
+            actions.append(action)
+        return actions
+
+def incrementalSearch(problem, heuristic=nullHeuristic):
+    """
+    Plans once with an IncrementalSearch.  Keep the IncrementalSearch object
+    itself to replan after costs change.
+    """
+    return IncrementalSearch(problem, heuristic).plan()
 
-            (state,actions,cost) = fringe.pop()
-        #############
-        
-        if problem.isGoalState(state):
-            return actions
+def _stitchPath(forward, backward, meet):
+    """
+    Returns the actions from the start to the goal through meet.  forward maps
+    a state to (parent, action) and backward maps a state to (child, action),
+    where action leads from the state to its child.  The start and the goal
+    map to None.
+    """
+    actions = []
+    state = meet
+    while forward[state] is not None:
+        state, action = forward[state]
+        actions.append(action)
+    actions.reverse()
+    state = meet
+    while backward[state] is not None:
+        state, action = backward[state]
+        actions.append(action)
+    return actions
+
+def bidirectionalBreadthFirstSearch(problem):
+    """
+    Breadth first search from the start and from problem.goal at the same time.
+
+    The problem needs an explicit goal state, problem.goal, and a
+    getPredecessors(state) method that returns (predecessor, action, stepCost)
+    triples, where action leads from the predecessor to state.  Each round
+    expands one whole layer of the smaller frontier.  When that layer reaches
+    states the other search has seen, the path is stitched at the one with
+    the fewest total steps, which is a shortest path in steps.
+    """
+    stats, _ = _beginStats(problem)
+    start, goal = problem.getStartState(), problem.goal
+    if start == goal:
+        return _endStats(stats, [])
+
+    # state -> (parent, action) and state -> (child, action)
+    forward, backward = {start: None}, {goal: None}
+    # state -> number of steps from the start, or to the goal
+    forwardDepth, backwardDepth = {start: 0}, {goal: 0}
+    forwardFringe, backwardFringe = [start], [goal]
+
+    while forwardFringe and backwardFringe:
+        meet = None
+        if len(forwardFringe) <= len(backwardFringe):
+            nextFringe = []
+            for state in forwardFringe:
+                for s, a, c in problem.getSuccessors(state):
+                    if s not in forward:
+                        forward[s] = (state, a)
+                        forwardDepth[s] = forwardDepth[state] + 1
+                        nextFringe.append(s)
+                        if s in backward and (meet is None or backwardDepth[s] < backwardDepth[meet]):
+                            meet = s
+            forwardFringe = nextFringe
+        else:
+            nextFringe = []
+            for state in backwardFringe:
+                for s, a, c in problem.getPredecessors(state):
+                    if s not in backward:
+                        backward[s] = (state, a)
+                        backwardDepth[s] = backwardDepth[state] + 1
+                        nextFringe.append(s)
+                        if s in forward and (meet is None or forwardDepth[s] < forwardDepth[meet]):
+                            meet = s
+            backwardFringe = nextFringe
+        if stats is not None:
+            stats.sample(len(forwardFringe) + len(backwardFringe), len(forward) + len(backward))
+
+        if meet is not None:
+            return _endStats(stats, _stitchPath(forward, backward, meet))
+
+    return _endStats(stats, None)
+
+class BidirectionalSide:
+    "The fringe, path costs and search tree of one half of bidirectionalAStarSearch"
+    def __init__(self, root, expand, estimate):
+        self.fringe = util.IndexedPriorityQueue()
+        self.fringe.push(root, estimate(root))
+        self.costs = {root: 0}
+        self.tree = {root: None}
+        self.closed = set()
+        self.costHeap = [(0, 0, root)]    # lazily cleaned, for the smallest g
+        self.expand = expand
+        self.estimate = estimate
+        self.other = None
+
+    def smallestCost(self):
+        "Returns the smallest path cost of a state on the fringe"
+        heap = self.costHeap
+        while heap and (heap[0][2] not in self.fringe or heap[0][0] != self.costs[heap[0][2]]):
+            heapq.heappop(heap)
+        return heap[0][0]
+
+def bidirectionalAStarSearch(problem, heuristic=nullHeuristic):
+    """
+    A* from the start towards problem.goal and from problem.goal back
+    towards the start, always expanding the side with the smaller fringe.
+
+    The problem needs problem.goal and getPredecessors, as for
+    bidirectionalBreadthFirstSearch.  The backward search evaluates the
+    heuristic on a ReversedGoalProblem whose goal is the start state, so the
+    heuristic must be consistent in both directions (manhattanHeuristic and
+    euclideanHeuristic are).  The cheapest path found so far through a state
+    seen by both searches is returned once no cheaper one can exist: when
+    its cost is at most the larger of the two smallest f values, or at most
+    the sum of the two smallest g values on the fringes.
+    """
+    stats, heuristic = _beginStats(problem, heuristic)
+    start, goal = problem.getStartState(), problem.goal
+    if start == goal:
+        return _endStats(stats, [])
+    reversedProblem = ReversedGoalProblem(problem, start)
+
+    forward = BidirectionalSide(start, problem.getSuccessors, lambda s: heuristic(s, problem))
+    backward = BidirectionalSide(goal, problem.getPredecessors, lambda s: heuristic(s, reversedProblem))
+    forward.other, backward.other = backward, forward
+
+    best, meet = float('inf'), None
+    pushes = 1
+    while not forward.fringe.isEmpty() and not backward.fringe.isEmpty():
+        if best <= max(forward.fringe.peekPriority(), backward.fringe.peekPriority()) or \
+           best <= forward.smallestCost() + backward.smallestCost():
+            break
+
+        side = forward if len(forward.fringe) <= len(backward.fringe) else backward
+        state = side.fringe.pop()
+        side.closed.add(state)
+        cost = side.costs[state]
+        for s, a, c in side.expand(state):
+            if s in side.closed:
+                continue
+            g = cost + c
+            if g < side.costs.get(s, float('inf')):
+                side.costs[s] = g
+                side.tree[s] = (state, a)
+                side.fringe.update(s, g + side.estimate(s))
+                heapq.heappush(side.costHeap, (g, pushes, s))
+                pushes += 1
+                otherCost = side.other.costs.get(s)
+                if otherCost is not None and g + otherCost < best:
+                    best, meet = g + otherCost, s
+        if stats is not None:
+            stats.sample(len(forward.fringe) + len(backward.fringe), len(forward.closed) + len(backward.closed))
+
+    if meet is None:
+        return _endStats(stats, None)
+    return _endStats(stats, _stitchPath(forward.tree, backward.tree, meet))
+
+
+def jumpPointSearch(problem, heuristic=nullHeuristic):
+    """
+    Jump Point Search (JPS) for 4-connected grids where every step costs 1,
+    such as a PositionSearchProblem with its default costFn.
+
+    Instead of pushing every neighbor, JPS jumps in a straight line until it
+    reaches a jump point: the goal, a cell where a wall ends beside the line
+    (a forced neighbor), or, when moving vertically, a cell from which a
+    horizontal jump finds one.  Only jump points go on the A* fringe, so the
+    many symmetric paths through open areas are never generated, while the
+    returned path cost stays the same as aStarSearch's.
+
+    The problem needs problem.walls and problem.goal, and states must be
+    (x,y) positions.  problem._expanded counts the expanded jump points, and
+    so do the expanded and generated counts of problem.searchStats.
+    """
+    from game import Actions
+
+    stats, heuristic = _beginStats(problem, heuristic)
+    walls, goal = problem.walls, problem.goal
+    width, height = walls.width, walls.height
+
+    def passable(x, y):
+        return 0 <= x < width and 0 <= y < height and not walls[x][y]
+
+    def jump(x, y, dx, dy):
+        "Returns the first jump point moving from (x,y) in direction (dx,dy), or None"
+        while True:
+            x, y = x + dx, y + dy
+            if not passable(x, y):
+                return None
+            if (x, y) == goal:
+                return (x, y)
+            if dx:
+                if (passable(x, y - 1) and not passable(x - dx, y - 1)) or \
+                   (passable(x, y + 1) and not passable(x - dx, y + 1)):
+                    return (x, y)
+            else:
+                if (passable(x - 1, y) and not passable(x - 1, y - dy)) or \
+                   (passable(x + 1, y) and not passable(x + 1, y - dy)):
+                    return (x, y)
+                if jump(x, y, 1, 0) is not None or jump(x, y, -1, 0) is not None:
+                    return (x, y)
+
+    allDirections = ((0, 1), (0, -1), (1, 0), (-1, 0))
+
+    fringe = util.IndexedPriorityQueue()
+    explored = set()
 
-        limit += 1 # increase the depth
+    start = problem.getStartState()
+    # a node's action is the unit vector of the jump that reached it
+    nodes = {start: SearchNode(start)}
+    fringe.push(start, 0)
+    goalNode = None
+    while not fringe.isEmpty():
+        state = fringe.pop()
+        node = nodes.pop(state)
 
+        if problem.isGoalState(state):
+            goalNode = node
+            break
+
+        explored.add(state)
+        problem._expanded += 1
+
+        if node.action is None:
+            directions = allDirections
+        elif node.action[0]:
+            # moving horizontally: keep going, or turn up or down
+            directions = ((0, 1), (0, -1), node.action)
+        else:
+            # moving vertically: keep going, or turn left or right
+            directions = ((1, 0), (-1, 0), node.action)
+
+        x, y = state
+        for dx, dy in directions:
+            s = jump(x, y, dx, dy)
+            if s is None or s in explored:
+                continue
+            cost = node.cost + abs(s[0] - x) + abs(s[1] - y)
+            if fringe.update(s, cost + heuristic(s, problem)):
+                nodes[s] = SearchNode(s, node, (dx, dy), cost)
+            if stats is not None:
+                stats.generated += 1
+        if stats is not None:
+            stats.expanded += 1
+            stats.sample(len(fringe), len(explored))
+
+    if goalNode is None:
+        return _endStats(stats, None)
+
+    # expand every jump into single steps
+    actions = []
+    node = goalNode
+    while node.parent is not None:
+        action = Actions.vectorToDirection(node.action)
+        steps = node.cost - node.parent.cost
+        actions.extend([action] * steps)
+        node = node.parent
+    actions.reverse()
+    return _endStats(stats, actions)
 
 
 # Abbreviations
@@ -231,4 +845,9 @@ bfs = breadthFirstSearch
 dfs = depthFirstSearch
 astar = aStarSearch
 ucs = uniformCostSearch
-ids = iterativeDeepeningSearch
\ No newline at end of file
+ids = iterativeDeepeningSearch
+bibfs = bidirectionalBreadthFirstSearch
+biastar = bidirectionalAStarSearch
+jps = jumpPointSearch
+arastar = anytimeRepairingAStarSearch
+dlite = incrementalSearch
\ No newline at end of file
@@ -37,9 +37,16 @@ Good luck and happy searching!
 from game import Directions
 from game import Agent
 from game import Actions
+from game import Grid
 import util
 import time
 import search
+import layoutCompiler
+import mazeDistances
+import searchStats
+import portfolioSearch
+import patternDatabase
+import foodTour
 
 class GoWestAgent(Agent):
     "An agent that goes West until it can't."
@@ -70,29 +77,67 @@ class SearchAgent(Agent):
       breadthFirstSearch or bfs
 
 
+    Pass stats=print to print a summary of every search (nodes generated,
+    fringe peak, time spent in the heuristic and goal test, see
+    searchStats.py), or stats=<file> to append it to file as JSON lines.
+
+    Pass timeLimit=<seconds> to give search functions that take a timeLimit
+    argument, such as anytimeRepairingAStarSearch (arastar), a time budget;
+    they return the best path found within it.
+
+    Pass portfolio=astar:foodHeuristic+ucs to race several search functions
+    (each with an optional heuristic) in worker processes and follow the
+    first optimal path found (see portfolioSearch.py).  portfolioTimeout
+    limits the race in seconds and portfolioLog appends every member's
+    statistics to a file as JSON lines.
+
     Note: You should NOT change any code in SearchAgent
     """
 
-    def __init__(self, fn='depthFirstSearch', prob='PositionSearchProblem', heuristic='nullHeuristic'):
+    # called with the SearchStats of every search when stats are enabled
+    statsListener = None
+    searchName = ''
+    # the PortfolioMembers raced instead of searchFunction, if any
+    portfolio = ()
+    portfolioTimeout = None
+    portfolioLog = None
+
+    def __init__(self, fn='depthFirstSearch', prob='PositionSearchProblem', heuristic='nullHeuristic', stats='',
+                 portfolio='', portfolioTimeout='', portfolioLog='', timeLimit=''):
         # Warning: some advanced Python magic is employed below to find the right functions and problems
 
-        # Get the search function from the name and heuristic
-        if fn not in dir(search):
-            raise AttributeError(fn + ' is not a search function in search.py.')
-        func = getattr(search, fn)
-        if 'heuristic' not in func.__code__.co_varnames:
-            print('[SearchAgent] using function ' + fn)
-            self.searchFunction = func
+        if portfolio:
+            self.portfolio = []
+            for member in portfolio.split('+'):
+                name, _, heuristicName = member.partition(':')
+                if name not in dir(search):
+                    raise AttributeError(name + ' is not a search function in search.py.')
+                func = getattr(search, name)
+                if 'heuristic' in func.__code__.co_varnames:
+                    heuristicName = heuristicName or 'nullHeuristic'
+                    self.portfolio.append(portfolioSearch.PortfolioMember(name, func, findHeuristic(heuristicName), heuristicName))
+                else:
+                    self.portfolio.append(portfolioSearch.PortfolioMember(name, func))
+            print('[SearchAgent] racing portfolio ' + ', '.join(member.label for member in self.portfolio))
+            # the members are searched instead of fn
+            self.searchFunction = None
         else:
-            if heuristic in globals().keys():
-                heur = globals()[heuristic]
-            elif heuristic in dir(search):
-                heur = getattr(search, heuristic)
+            # Get the search function from the name and heuristic
+            if fn not in dir(search):
+                raise AttributeError(fn + ' is not a search function in search.py.')
+            func = getattr(search, fn)
+            options = {}
+            if timeLimit and 'timeLimit' in func.__code__.co_varnames:
+                options['timeLimit'] = float(timeLimit)
+                print('[SearchAgent] using a time limit of %s seconds' % timeLimit)
+            if 'heuristic' not in func.__code__.co_varnames:
+                print('[SearchAgent] using function ' + fn)
+                self.searchFunction = lambda x: func(x, **options)
             else:
-                raise AttributeError(heuristic + ' is not a function in searchAgents.py or search.py.')
-            print('[SearchAgent] using function %s and heuristic %s' % (fn, heuristic))
-            # Note: this bit of Python trickery combines the search algorithm and the heuristic
-            self.searchFunction = lambda x: func(x, heuristic=heur)
+                heur = findHeuristic(heuristic)
+                print('[SearchAgent] using function %s and heuristic %s' % (fn, heuristic))
+                # Note: this bit of Python trickery combines the search algorithm and the heuristic
+                self.searchFunction = lambda x: func(x, heuristic=heur, **options)
 
         # Get the search problem type from the name
         if prob not in globals().keys() or not prob.endswith('Problem'):
@@ -100,6 +145,17 @@ class SearchAgent(Agent):
         self.searchType = globals()[prob]
         print('[SearchAgent] using problem type ' + prob)
 
+        self.searchName = fn
+        if stats == 'print':
+            self.statsListener = searchStats.printStats
+        elif stats:
+            self.statsListener = searchStats.JSONSink(stats)
+
+        if portfolioTimeout:
+            self.portfolioTimeout = float(portfolioTimeout)
+        if portfolioLog:
+            self.portfolioLog = portfolioLog
+
     def registerInitialState(self, state):
         """
         This is the first time that the agent sees the layout of the game
@@ -109,13 +165,26 @@ class SearchAgent(Agent):
 
         state: a GameState object (pacman.py)
         """
-        if self.searchFunction == None: raise Exception("No search function provided for SearchAgent")
+        if self.searchFunction == None and not self.portfolio: raise Exception("No search function provided for SearchAgent")
         starttime = time.time()
         problem = self.searchType(state) # Makes a new search problem
-        self.actions  = self.searchFunction(problem) # Find a path
+        if self.portfolio:
+            self.actions, record = portfolioSearch.runPortfolio(self.portfolio, self.searchType, state,
+                                                                self.portfolioTimeout, self.portfolioLog)
+            if self.actions is None:
+                raise Exception('No search function in the portfolio found a path')
+            for outcome in record['members']:
+                print('[SearchAgent] %s %s after %.2f seconds' % (outcome['member'], outcome['status'], outcome['seconds']))
+                if outcome['status'] == 'won':
+                    problem._expanded = outcome['stats']['expanded']
+        else:
+            if self.statsListener is not None:
+                problem.searchStats = searchStats.SearchStats(self.searchName, type(problem).__name__, [self.statsListener])
+            self.actions  = self.searchFunction(problem) # Find a path
         totalCost = problem.getCostOfActions(self.actions)
         print('Path found with total cost of %d in %.1f seconds' % (totalCost, time.time() - starttime))
         if '_expanded' in dir(problem): print('Search nodes expanded: %d' % problem._expanded)
+        if '_suboptimalityBound' in dir(problem): print('Suboptimality bound: %.3f' % problem._suboptimalityBound)
 
     def getAction(self, state):
         """
@@ -133,6 +202,14 @@ class SearchAgent(Agent):
         else:
             return Directions.STOP
 
+def findHeuristic(name):
+    "Returns the heuristic function called name in searchAgents.py or search.py"
+    if name in globals().keys():
+        return globals()[name]
+    elif name in dir(search):
+        return getattr(search, name)
+    raise AttributeError(name + ' is not a function in searchAgents.py or search.py.')
+
 class PositionSearchProblem(search.SearchProblem):
     """
     A search problem defines the state space, start state, goal test, successor
@@ -161,6 +238,10 @@ class PositionSearchProblem(search.SearchProblem):
         if warn and (gameState.getNumFood() != 1 or not gameState.hasFood(*goal)):
             print('Warning: this does not look like a regular search maze')
 
+        # The neighbor table of the layout, and the cost of stepping into each cell
+        self.layout = layoutCompiler.compileLayout(self.walls)
+        self.cellCosts = self.layout.cellCosts(costFn)
+
         # For display purposes
         self._visited, self._visitedlist, self._expanded = {}, [], 0 # DO NOT CHANGE
 
@@ -192,15 +273,8 @@ class PositionSearchProblem(search.SearchProblem):
          cost of expanding to that successor
         """
 
-        successors = []
-        for action in [Directions.NORTH, Directions.SOUTH, Directions.EAST, Directions.WEST]:
-            x,y = state
-            dx, dy = Actions.directionToVector(action)
-            nextx, nexty = int(x + dx), int(y + dy)
-            if not self.walls[nextx][nexty]:
-                nextState = (nextx, nexty)
-                cost = self.costFn(nextState)
-                successors.append( ( nextState, action, cost) )
+        cells, costs = self.layout.cells, self.cellCosts
+        successors = [ ( cells[n], action, costs[n] ) for n, action in self.layout.moves[self.layout.index[state]] ]
 
         # Bookkeeping for display purposes
         self._expanded += 1 # DO NOT CHANGE
@@ -210,6 +284,42 @@ class PositionSearchProblem(search.SearchProblem):
 
         return successors
 
+    def getPredecessors(self, state):
+        """
+        Returns the states one move away from state, the action that leads from
+        each of them to state, and the cost of that move.  This is the reverse
+        of getSuccessors and is used by the bidirectional searches in
+        search.py.
+        """
+        # Moves are reversible, so the predecessors are the neighbors
+        cells, reverse = self.layout.cells, Directions.REVERSE
+        cell = self.layout.index[state]
+        cost = self.cellCosts[cell]
+        predecessors = [ ( cells[n], reverse[action], cost ) for n, action in self.layout.moves[cell] ]
+
+        # Bookkeeping for display purposes
+        self._expanded += 1 # DO NOT CHANGE
+        if state not in self._visited:
+            self._visited[state] = True
+            self._visitedlist.append(state)
+
+        return predecessors
+
+    def setCellCosts(self, costs):
+        """
+        Changes the cost of stepping into some positions, for example around
+        a ghost that moved; costs maps positions to their new cost, and
+        float('inf') makes a position impassable.  Returns the positions
+        whose cost actually changed, ready for IncrementalSearch.notifyChanged.
+        """
+        changed = []
+        for position, cost in costs.items():
+            cell = self.layout.index[position]
+            if self.cellCosts[cell] != cost:
+                self.cellCosts[cell] = cost
+                changed.append(position)
+        return changed
+
     def getCostOfActions(self, actions):
         """
         Returns the cost of a particular sequence of actions. If those actions
@@ -223,7 +333,7 @@ class PositionSearchProblem(search.SearchProblem):
             dx, dy = Actions.directionToVector(action)
             x, y = int(x + dx), int(y + dy)
             if self.walls[x][y]: return 999999
-            cost += self.costFn((x,y))
+            cost += self.cellCosts[self.layout.index[(x,y)]]
         return cost
 
 class StayEastSearchAgent(SearchAgent):
@@ -268,11 +378,21 @@ def euclideanHeuristic(position, problem, info={}):
 # This portion is incomplete.  Time to write code!  #
 #####################################################
 
+# A CornersProblem state keeps one bit per corner below the cell index
+CORNER_BITS = 4
+ALL_CORNERS = (1 << CORNER_BITS) - 1
+
 class CornersProblem(search.SearchProblem):
     """
     This search problem finds paths through all four corners of a layout.
 
     You must select a suitable state space and successor function
+
+    A state is a single int, (cellIndex << 4) | cornerMask, where cellIndex
+    numbers Pacman's position among the open cells (see problem.cells) and
+    bit i of cornerMask is set while problem.corners[i] has not been
+    visited.  The legal moves of every cell are computed once, when the
+    problem is created, so expanding a state only builds the successor ints.
     """
 
     def __init__(self, startingGameState):
@@ -290,6 +410,18 @@ class CornersProblem(search.SearchProblem):
         # Please add any code here which you would like to use
         # in initializing the problem
         "*** YOUR CODE HERE ***"
+        self.heuristicInfo = {} # A dictionary for the heuristic to store information
+
+        layout = layoutCompiler.compileLayout(self.walls)
+        self.cells = layout.cells
+        self.cellIndex = layout.index
+        cornerBits = dict((corner, 1 << i) for i, corner in enumerate(self.corners))
+        keep = [ALL_CORNERS & ~cornerBits.get(cell, 0) for cell in self.cells]
+
+        # For every cell, a tuple of (shifted neighbor index, mask of the
+        # corners still left after stepping there, action) entries
+        self._moves = [tuple((n << CORNER_BITS, keep[n], action) for n, action in moves)
+                       for moves in layout.moves]
 
     def getStartState(self):
         """
@@ -298,15 +430,14 @@ class CornersProblem(search.SearchProblem):
         """
         "*** YOUR CODE HERE ***"
 
-        state = (self.startingPosition, (0, 1, 2, 3))
-        return state
+        return self.cellIndex[self.startingPosition] << CORNER_BITS | ALL_CORNERS
 
     def isGoalState(self, state):
         """
         Returns whether this search state is a goal state of the problem.
         """
         "*** YOUR CODE HERE ***"
-        return not state[1]
+        return not state & ALL_CORNERS
 
     def getSuccessors(self, state):
         """
@@ -319,43 +450,22 @@ class CornersProblem(search.SearchProblem):
             is the incremental cost of expanding to that successor
         """
 
-        successors = []
-        for action in [Directions.NORTH, Directions.WEST, Directions.SOUTH, Directions.EAST]:
-            # Add a successor state to the successor list if the action is legal
-            # Here's a code snippet for figuring out whether a new position hits a wall:
-            #   x,y = currentPosition
-            #   dx, dy = Actions.directionToVector(action)
-            #   nextx, nexty = int(x + dx), int(y + dy)
-            #   hitsWall = self.walls[nextx][nexty]
-
-            "*** YOUR CODE HERE ***"
-
-            x, y = state[0]
-            dx, dy = Actions.directionToVector(action)
-            next_x, next_y = int(x + dx), int(y + dy)
-            hitsWall = self.walls[next_x][next_y]
-
-            if not hitsWall:
-                # Change state[1] if reaches corner
-                reminde_corners = state[1]
-                next_location = (next_x, next_y)
-                try:
-                    # Find out if the successor is a corner
-                    index = self.corners.index(next_location)
-                except:
-                    pass
-                else:
-                    if index in reminde_corners:
-                        temp = list(reminde_corners)
-                        temp.remove(index)
-                        reminde_corners = tuple(temp)
-
-                next_state = (next_location, reminde_corners)
-                successors.append((next_state, action, 1))
+        "*** YOUR CODE HERE ***"
+        corners_left = state & ALL_CORNERS
+        successors = [(next_cell | (corners_left & keep), action, 1)
+                      for next_cell, keep, action in self._moves[state >> CORNER_BITS]]
 
         self._expanded += 1 # DO NOT CHANGE
         return successors
 
+    def getPosition(self, state):
+        "Returns Pacman's (x,y) position in state"
+        return self.cells[state >> CORNER_BITS]
+
+    def getCornersLeft(self, state):
+        "Returns the indices (into self.corners) of the corners not yet visited in state"
+        return tuple(i for i in range(len(self.corners)) if state >> i & 1)
+
     def getCostOfActions(self, actions):
         """
         Returns the cost of a particular sequence of actions.  If those actions
@@ -387,14 +497,24 @@ def cornersHeuristic(state, problem):
 
     "*** YOUR CODE HERE ***"
 
-    position = state[0]
-    cornersIndices = state[1]
-
-    if not cornersIndices:
-        return 0
+    # max manhattan distance among all remained corners, looked up in a
+    # table that is indexed by the state itself
+    table = problem.heuristicInfo.get('cornersTable')
+    if table is None:
+        table = problem.heuristicInfo['cornersTable'] = cornersHeuristicTable(problem)
+    return table[state]
 
-    # max manhattan distance among all remained corners
-    return max([util.manhattanDistance(position, corners[index]) for index in cornersIndices])
+def cornersHeuristicTable(problem):
+    """
+    Returns a list that holds cornersHeuristic for every state of problem:
+    the largest manhattan distance from the cell to a corner not yet visited.
+    """
+    table = []
+    for position in problem.cells:
+        distances = [util.manhattanDistance(position, corner) for corner in problem.corners]
+        for corners_left in range(ALL_CORNERS + 1):
+            table.append(max([d for i, d in enumerate(distances) if corners_left >> i & 1] or [0]))
+    return table
 
 
 class AStarCornersAgent(SearchAgent):
@@ -408,14 +528,24 @@ class FoodSearchProblem:
     A search problem associated with finding the a path that collects all of the
     food (dots) in a Pacman game.
 
-    A search state in this problem is a tuple ( pacmanPosition, foodGrid ) where
+    A search state in this problem is a tuple ( pacmanPosition, foodMask ) where
       pacmanPosition: a tuple (x,y) of integers specifying Pacman's position
-      foodGrid:       a Grid (see game.py) of either True or False, specifying remaining food
+      foodMask:       an int whose bit i is set while the food at
+                      problem.foodPositions[i] has not been eaten
+
+    The food set is kept as a bitmask so that successors do not copy a whole
+    Grid and states hash in constant time.  Use getFoodGrid or getFoodList to
+    convert a mask back at the edges.
     """
     def __init__(self, startingGameState):
-        self.start = (startingGameState.getPacmanPosition(), startingGameState.getFood())
         self.walls = startingGameState.getWalls()
         self.startingGameState = startingGameState
+        self.foodPositions = startingGameState.getFood().asList()
+        self.foodBits = dict((food, 1 << i) for i, food in enumerate(self.foodPositions))
+        self.layout = layoutCompiler.compileLayout(self.walls)
+        # the bit of the food in every cell, 0 for cells without food
+        self._cellFoodBits = [self.foodBits.get(cell, 0) for cell in self.layout.cells]
+        self.start = (startingGameState.getPacmanPosition(), (1 << len(self.foodPositions)) - 1)
         self._expanded = 0 # DO NOT CHANGE
         self.heuristicInfo = {} # A dictionary for the heuristic to store information
 
@@ -423,22 +553,33 @@ class FoodSearchProblem:
         return self.start
 
     def isGoalState(self, state):
-        return state[1].count() == 0
+        return state[1] == 0
 
     def getSuccessors(self, state):
         "Returns successor states, the actions they require, and a cost of 1."
         successors = []
         self._expanded += 1 # DO NOT CHANGE
-        for direction in [Directions.NORTH, Directions.SOUTH, Directions.EAST, Directions.WEST]:
-            x,y = state[0]
-            dx, dy = Actions.directionToVector(direction)
-            nextx, nexty = int(x + dx), int(y + dy)
-            if not self.walls[nextx][nexty]:
-                nextFood = state[1].copy()
-                nextFood[nextx][nexty] = False
-                successors.append( ( ((nextx, nexty), nextFood), direction, 1) )
+        position, foodMask = state
+        cells, foodBits = self.layout.cells, self._cellFoodBits
+        for n, direction in self.layout.moves[self.layout.index[position]]:
+            successors.append( ( (cells[n], foodMask & ~foodBits[n]), direction, 1) )
         return successors
 
+    def getFoodCount(self, foodMask):
+        "Returns the number of foods left in foodMask"
+        return bin(foodMask).count('1')
+
+    def getFoodList(self, foodMask):
+        "Returns the positions of the foods left in foodMask"
+        return [food for i, food in enumerate(self.foodPositions) if foodMask >> i & 1]
+
+    def getFoodGrid(self, foodMask):
+        "Returns the foods left in foodMask as a Grid (see game.py)"
+        grid = Grid(self.walls.width, self.walls.height, False)
+        for x, y in self.getFoodList(foodMask):
+            grid[x][y] = True
+        return grid
+
     def getCostOfActions(self, actions):
         """Returns the cost of a particular sequence of actions.  If those actions
         include an illegal move, return 999999"""
@@ -459,6 +600,16 @@ class AStarFoodSearchAgent(SearchAgent):
         self.searchFunction = lambda prob: search.aStarSearch(prob, foodHeuristic)
         self.searchType = FoodSearchProblem
 
+class FoodTourAgent(SearchAgent):
+    """
+    A SearchAgent for FoodSearchProblem that plans the order of the dots as
+    a tour over maze distances (see foodTour.py) instead of searching.  The
+    path is optimal with few dots and near optimal on large boards.
+    """
+    def __init__(self):
+        self.searchFunction = foodTour.foodTourSearch
+        self.searchType = FoodSearchProblem
+
 def foodHeuristic(state, problem):
     """
     Your heuristic for the FoodSearchProblem goes here.
@@ -472,9 +623,10 @@ def foodHeuristic(state, problem):
     other hand, inadmissible or inconsistent heuristics may find optimal
     solutions, so be careful.
 
-    The state is a tuple ( pacmanPosition, foodGrid ) where foodGrid is a Grid
-    (see game.py) of either True or False. You can call foodGrid.asList() to get
-    a list of food coordinates instead.
+    The state is a tuple ( pacmanPosition, foodMask ) where foodMask is an int
+    bitmask over problem.foodPositions. You can call
+    problem.getFoodList(foodMask) to get a list of food coordinates, or
+    problem.getFoodGrid(foodMask) to get a Grid (see game.py).
 
     If you want access to info like walls, capsules, etc., you can query the
     problem.  For example, problem.walls gives you a Grid of where the walls
@@ -487,34 +639,114 @@ def foodHeuristic(state, problem):
     Subsequent calls to this heuristic can access
     problem.heuristicInfo['wallCount']
     """
-    position, foodGrid = state
+    position, foodMask = state
     "*** YOUR CODE HERE ***"
-    foods = foodGrid.asList()
-    if not foods:
+    # Any path that eats all the food first walks to some food and then
+    # connects all of the food, so the maze distance to the nearest food plus
+    # the weight of a minimum spanning tree over the food (under maze
+    # distance) is a lower bound.  It is also consistent: a step changes the
+    # nearest food distance by at most one, and eating a food shrinks the
+    # tree by at most the distance from that food to the next nearest one.
+    if not foodMask:
         return 0
 
-    if not len(foods):
+    info = problem.heuristicInfo
+    if 'foodMst' not in info:
+        maze = mazeDistances.getMazeDistances(problem.walls)
+        info['foodMst'] = util.LRUCache(FOOD_MST_CACHE_SIZE)
+        info['foodCells'] = [maze.index[food] for food in problem.foodPositions]
+        # the distance field of every food, held here so that a DistanceFields
+        # cache never has to compute one again
+        info['foodFields'] = [maze.getDistances(food) for food in problem.foodPositions]
+        info['mazeDistances'] = maze
+    foods = [i for i in range(len(info['foodCells'])) if foodMask >> i & 1]
+    cells = [info['foodCells'][i] for i in foods]
+    fields = [info['foodFields'][i] for i in foods]
+
+    mstCache = info['foodMst']
+    mst = mstCache.get(foodMask)
+    if mst is None:
+        mst = mstCache[foodMask] = minimumSpanningTreeWeight(cells, fields)
+
+    cell = info['mazeDistances'].index[position]
+    return min([field[cell] for field in fields]) + mst
+
+# Number of food sets whose spanning tree weight foodHeuristic remembers
+FOOD_MST_CACHE_SIZE = 100000
+
+def pdbFoodHeuristic(state, problem):
+    """
+    The larger of foodHeuristic and a pattern database of the food (see
+    patternDatabase.py).  Both are consistent, so their maximum is too.  The
+    database is solved, or loaded from its cache file, on the first call.
+    """
+    position, foodMask = state
+    if not foodMask:
         return 0
+    pdb = problem.heuristicInfo.get('foodPdb')
+    if pdb is None:
+        pdb = problem.heuristicInfo['foodPdb'] = patternDatabase.getFoodPatternDatabase(problem.walls, problem.foodPositions)
+    return max(pdb.getValue(position, foodMask), foodHeuristic(state, problem))
 
-    distances = []
-    for food_position in foods[:]:
-        distances.append(mazeDistance(position, food_position, problem.startingGameState))
-    return max(distances)
+def minimumSpanningTreeWeight(cells, fields):
+    """
+    Returns the weight of a minimum spanning tree over cells (indices into
+    the cells of a CompiledLayout) under maze distance, using Prim's
+    algorithm.  fields[i] is the distance field of cells[i] (see
+    mazeDistances.py).
+    """
+    if len(cells) < 2:
+        return 0
+    # best[i] is the cheapest edge from rest[i] into the tree built so far
+    rest = list(range(1, len(cells)))
+    best = [fields[0][cells[i]] for i in rest]
+    weight = 0
+    while rest:
+        closest = min(range(len(best)), key=best.__getitem__)
+        weight += best[closest]
+        field = fields[rest[closest]]
+        rest[closest], best[closest] = rest[-1], best[-1]
+        rest.pop()
+        best.pop()
+        for i, vertex in enumerate(rest):
+            d = field[cells[vertex]]
+            if d < best[i]:
+                best[i] = d
+    return weight
 
 class ClosestDotSearchAgent(SearchAgent):
     "Search for all food using a sequence of searches"
     def registerInitialState(self, state):
+        """
+        Plans every segment from the layout's maze distances (see
+        mazeDistances.getMazeDistances): the closest dot is the one with the
+        smallest entry in the distance field of Pacman's position, and the
+        path to it follows the distance fields.  On layouts small enough for
+        a DistanceTable the fields are computed once per layout and no
+        segment runs a search; on larger ones each segment runs a single
+        breadth first search from Pacman's position.
+        """
         self.actions = []
-        currentState = state
-        while(currentState.getFood().count() > 0):
-            nextPathSegment = self.findPathToClosestDot(currentState) # The missing piece
+        maze = mazeDistances.getMazeDistances(state.getWalls())
+        position = state.getPacmanPosition()
+        food = state.getFood().asList()
+        while food:
+            distances = maze.getDistances(position)
+            reachable = [dot for dot in food if distances[maze.index[dot]] != mazeDistances.UNREACHABLE]
+            if not reachable:
+                break
+            closest = min(reachable, key=lambda dot: distances[maze.index[dot]])
+            nextPathSegment = maze.getPath(position, closest)
             self.actions += nextPathSegment
+            # Eat every dot on the way, not only the closest one
+            x, y = position
+            eaten = set()
             for action in nextPathSegment:
-                legal = currentState.getLegalActions()
-                if action not in legal:
-                    t = (str(action), str(currentState))
-                    raise Exception('findPathToClosestDot returned an illegal move: %s!\n%s' % t)
-                currentState = currentState.generateSuccessor(0, action)
+                dx, dy = Actions.directionToVector(action)
+                x, y = int(x + dx), int(y + dy)
+                eaten.add((x, y))
+            position = (x, y)
+            food = [dot for dot in food if dot not in eaten]
         self.actionIndex = 0
         print('Path found with cost %d.' % len(self.actions))
 
@@ -530,7 +762,8 @@ class ClosestDotSearchAgent(SearchAgent):
         problem = AnyFoodSearchProblem(gameState)
 
         "*** YOUR CODE HERE ***"
-        return search.ids(problem)
+        # A single breadth first search that stops at the first dot it pops
+        return search.bfs(problem)
 
 class AnyFoodSearchProblem(PositionSearchProblem):
     """
@@ -556,6 +789,8 @@ class AnyFoodSearchProblem(PositionSearchProblem):
         self.walls = gameState.getWalls()
         self.startState = gameState.getPacmanPosition()
         self.costFn = lambda x: 1
+        self.layout = layoutCompiler.compileLayout(self.walls)
+        self.cellCosts = [1] * self.layout.size
         self._visited, self._visitedlist, self._expanded = {}, [], 0 # DO NOT CHANGE
 
     def isGoalState(self, state):
@@ -566,9 +801,7 @@ class AnyFoodSearchProblem(PositionSearchProblem):
         x,y = state
 
         "*** YOUR CODE HERE ***"
-        if state in self.food.asList():
-            return True
-        return False
+        return self.food[x][y]
 
 def mazeDistance(point1, point2, gameState):
     """
@@ -579,11 +812,30 @@ def mazeDistance(point1, point2, gameState):
     Example usage: mazeDistance( (2,4), (5,6), gameState)
 
     This might be a useful helper function for your ApproximateSearchAgent.
+
+    On layouts small enough for an all-pairs table the distances between all
+    pairs of open cells are computed once per layout, so after the first call
+    this is a table lookup.  Larger ones run a breadth first search from
+    point1, and recent sources are cached (see mazeDistances.getMazeDistances).
     """
     x1, y1 = point1
     x2, y2 = point2
     walls = gameState.getWalls()
     assert not walls[x1][y1], 'point1 is a wall: ' + str(point1)
     assert not walls[x2][y2], 'point2 is a wall: ' + str(point2)
-    prob = PositionSearchProblem(gameState, start=point1, goal=point2, warn=False, visualize=False)
-    return len(search.bfs(prob))
+    return mazeDistances.getMazeDistances(walls).getDistance(point1, point2)
+
+def mazeDistancesFrom(point, targets, gameState):
+    """
+    Returns a list with the maze distance from point to each position in
+    targets, for callers that need many distances from the same source.
+
+    Example usage: mazeDistancesFrom(pacmanPosition, foodList, gameState)
+
+    Layouts small enough for an all-pairs table read one row of it; larger
+    ones run a single breadth first search from point, and recent sources
+    are cached (see mazeDistances.getMazeDistances).
+    """
+    walls = gameState.getWalls()
+    assert not walls[point[0]][point[1]], 'point is a wall: ' + str(point)
+    return list(mazeDistances.getMazeDistances(walls).batchDistances(point, targets))
@@ -0,0 +1,261 @@
+# searchBenchmark.py
+# ------------------
+# Licensing Information:  You are free to use or extend these projects for
+# educational purposes provided that (1) you do not distribute or publish
+# solutions, (2) you retain this notice, and (3) you provide clear
+# attribution to UC Berkeley, including a link to http://ai.berkeley.edu.
+#
+# Attribution Information: The Pacman AI projects were developed at UC Berkeley.
+# The core projects and autograders were primarily created by John DeNero
+# (denero@cs.berkeley.edu) and Dan Klein (klein@cs.berkeley.edu).
+# Student side autograding was added by Brad Miller, Nick Hay, and
+# Pieter Abbeel (pabbeel@cs.berkeley.edu).
+
+
+"""
+Benchmark for the search functions in search.py.
+
+Generates layouts with mazeGenerator.py (and/or loads named ones from the
+layouts directory), then runs every algorithm on every search problem with
+every heuristic that applies.  For each run it reports the path cost, the
+nodes expanded and generated, the fringe peak, the time and the peak memory
+allocated by Python (measured with tracemalloc in a second run, as tracing
+slows the search down).  Every run happens in its own process, so runs do
+not share caches and one that exceeds --timeout is stopped.  A run that
+crashes is reported as an error with the exit code of its process.
+
+Save the results with --json and compare a later run against them with
+--baseline:
+
+> python searchBenchmark.py --sizes 11,21,41 --json before.json
+> python searchBenchmark.py --sizes 11,21,41 --baseline before.json
+> python searchBenchmark.py --layouts mediumMaze,trickySearch --algorithms astar
+"""
+
+import contextlib
+import io
+import json
+import multiprocessing
+import time
+import tracemalloc
+import mazeGenerator
+import search
+import searchAgents
+import searchStats
+
+ALGORITHMS = ['bfs', 'dfs', 'ucs', 'astar', 'ids']
+
+# The heuristics swept for each problem by algorithms that take one
+PROBLEMS = {
+    'PositionSearchProblem': ['nullHeuristic', 'manhattanHeuristic', 'euclideanHeuristic'],
+    'CornersProblem': ['nullHeuristic', 'cornersHeuristic'],
+    'FoodSearchProblem': ['nullHeuristic', 'foodHeuristic'],
+}
+
+COLUMNS = ['layout', 'algorithm', 'problem', 'heuristic', 'cost', 'expanded', 'generated', 'maxFringe', 'seconds', 'peakKiB']
+
+def generatedLayouts(kinds, sizes, seeds, food):
+    "Returns (name, rows) for every combination of layout kind, size and seed"
+    layouts = []
+    for kind in kinds:
+        for size in sizes:
+            for seed in seeds:
+                if kind == 'maze':
+                    rows = mazeGenerator.generateMaze(size, size, seed)
+                elif kind == 'rooms':
+                    rows = mazeGenerator.generateRooms(size, size, seed)
+                else:
+                    rows = mazeGenerator.generateFood(size, size, seed, food)
+                layouts.append(('%s%d-s%d' % (kind, size, seed), rows))
+    return layouts
+
+def namedLayouts(names):
+    "Returns (name, rows) for layouts in the layouts directory"
+    import layout
+    layouts = []
+    for name in names:
+        lay = layout.getLayout(name)
+        if lay is None:
+            raise Exception('The layout ' + name + ' cannot be found')
+        layouts.append((name, lay.layoutText))
+    return layouts
+
+def cases(algorithms, problems):
+    "Returns the (algorithm, problem, heuristic) triples to run; heuristic is None if unused"
+    triples = []
+    for algorithm in algorithms:
+        usesHeuristic = 'heuristic' in getattr(search, algorithm).__code__.co_varnames
+        for problem in problems:
+            for heuristic in (PROBLEMS[problem] if usesHeuristic else [None]):
+                triples.append((algorithm, problem, heuristic))
+    return triples
+
+def _runCase(rows, algorithm, problemName, heuristicName, traceMemory, connection):
+    "Runs one search in a worker process and sends back its row"
+    import layout
+    import pacman
+    gameState = pacman.GameState()
+    gameState.initialize(layout.Layout(rows), 0)
+    function = getattr(search, algorithm)
+
+    # the problems print warnings about unusual layouts
+    with contextlib.redirect_stdout(io.StringIO()):
+        if traceMemory:
+            tracemalloc.start()
+        problem = getattr(searchAgents, problemName)(gameState)
+        stats = searchStats.SearchStats(algorithm, problemName)
+        problem.searchStats = stats
+        start = time.perf_counter()
+        if heuristicName is None:
+            actions = function(problem)
+        else:
+            heuristic = getattr(searchAgents, heuristicName, None) or getattr(search, heuristicName)
+            actions = function(problem, heuristic=heuristic)
+        seconds = time.perf_counter() - start
+        if traceMemory:
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            connection.send({'peakKiB': peak // 1024})
+            return
+        cost = None if actions is None else problem.getCostOfActions(actions)
+
+    connection.send({'cost': cost, 'expanded': stats.expanded, 'generated': stats.generated,
+                     'maxFringe': stats.maxFringe, 'seconds': seconds})
+
+def _runInProcess(args, timeout):
+    """
+    Returns (status, result): ('ok', what _runCase sent), ('timeout', None)
+    if it took longer than timeout seconds, or ('error', exit code) if the
+    process ended without sending anything.
+    """
+    receiver, sender = multiprocessing.Pipe(duplex=False)
+    process = multiprocessing.Process(target=_runCase, args=args + (sender,))
+    process.start()
+    sender.close()
+    status, result = 'timeout', None
+    # the pipe also becomes readable when the process dies, as recv then
+    # raises EOFError
+    if receiver.poll(timeout):
+        try:
+            status, result = 'ok', receiver.recv()
+        except EOFError:
+            status = 'error'
+    if process.is_alive():
+        process.terminate()
+    process.join()
+    if status == 'error':
+        result = process.exitcode
+    return status, result
+
+def runBenchmark(layouts, triples, timeout=30, memory=True):
+    "Runs every case on every layout and returns a list of rows, one dictionary per run"
+    results = []
+    for name, rows in layouts:
+        for algorithm, problem, heuristic in triples:
+            row = {'layout': name, 'algorithm': algorithm, 'problem': problem, 'heuristic': heuristic or '-'}
+            status, result = _runInProcess((rows, algorithm, problem, heuristic, False), timeout)
+            row['status'] = status
+            if status == 'error':
+                row['exitCode'] = result
+            elif status == 'ok':
+                row.update(result)
+                if memory:
+                    status, result = _runInProcess((rows, algorithm, problem, heuristic, True), timeout)
+                    if status == 'ok':
+                        row.update(result)
+            results.append(row)
+    return results
+
+def _key(row):
+    return (row['layout'], row['algorithm'], row['problem'], row['heuristic'])
+
+def printRows(results, baseline=None):
+    """
+    Prints the results as a table.  With a baseline (a list of rows from an
+    earlier run), the expansions and time of each run are also shown as a
+    ratio to the same run in the baseline.
+    """
+    header = '%-16s %-9s %-22s %-19s %6s %9s %9s %8s %9s %9s' % tuple(COLUMNS)
+    if baseline is not None:
+        header += ' %9s %9s' % ('expanded%', 'time%')
+        baseline = dict((_key(row), row) for row in baseline)
+    print(header)
+    for row in results:
+        if row['status'] != 'ok':
+            status = row['status']
+            if status == 'error':
+                status = 'error (exit code %s)' % row['exitCode']
+            print('%-16s %-9s %-22s %-19s %s' % (row['layout'], row['algorithm'], row['problem'], row['heuristic'], status))
+            continue
+        line = '%-16s %-9s %-22s %-19s %6s %9d %9d %8d %9.4f %9s' % (
+            row['layout'], row['algorithm'], row['problem'], row['heuristic'], row['cost'],
+            row['expanded'], row['generated'], row['maxFringe'], row['seconds'], row.get('peakKiB', '-'))
+        if baseline is not None:
+            old = baseline.get(_key(row))
+            if old is not None and old['status'] == 'ok':
+                line += ' %9s %9s' % (_percent(row['expanded'], old['expanded']), _percent(row['seconds'], old['seconds']))
+        print(line)
+
+def _percent(new, old):
+    if not old:
+        return '-'
+    return '%.0f%%' % (100.0 * new / old)
+
+def _splitList(text):
+    return [item for item in text.split(',') if item]
+
+def readCommand(argv):
+    from optparse import OptionParser
+    parser = OptionParser(usage=__doc__)
+    parser.add_option('--kinds', dest='kinds', default='maze,rooms,food',
+                      help='comma separated generated layout kinds (default %default)')
+    parser.add_option('--sizes', dest='sizes', default='11,21',
+                      help='comma separated widths of the square generated layouts, 10 to 1000 (default %default)')
+    parser.add_option('--seeds', dest='seeds', default='0',
+                      help='comma separated generator seeds (default %default)')
+    parser.add_option('--food', dest='food', type='int', default=6,
+                      help='food dots in generated food layouts (default %default)')
+    parser.add_option('--layouts', dest='layouts', default='',
+                      help='comma separated layouts from the layouts directory; replaces the generated ones')
+    parser.add_option('--algorithms', dest='algorithms', default=','.join(ALGORITHMS),
+                      help='comma separated search functions (default %default)')
+    parser.add_option('--problems', dest='problems', default=','.join(sorted(PROBLEMS)),
+                      help='comma separated search problems (default %default)')
+    parser.add_option('--timeout', dest='timeout', type='float', default=30,
+                      help='seconds before a run is stopped (default %default)')
+    parser.add_option('--noMemory', dest='memory', action='store_false', default=True,
+                      help='skip the second, traced run that measures peak memory')
+    parser.add_option('--json', dest='json', default=None,
+                      help='file to write the results to as JSON')
+    parser.add_option('--baseline', dest='baseline', default=None,
+                      help='JSON results of an earlier run to compare against')
+    options, otherjunk = parser.parse_args(argv)
+    if len(otherjunk) != 0:
+        raise Exception('Command line input not understood: ' + str(otherjunk))
+    for problem in _splitList(options.problems):
+        if problem not in PROBLEMS:
+            raise Exception('Unknown search problem: ' + problem)
+    for algorithm in _splitList(options.algorithms):
+        if not hasattr(search, algorithm):
+            raise Exception(algorithm + ' is not a search function in search.py')
+    return options
+
+if __name__ == '__main__':
+    import sys
+    options = readCommand(sys.argv[1:])
+    if options.layouts:
+        layouts = namedLayouts(_splitList(options.layouts))
+    else:
+        layouts = generatedLayouts(_splitList(options.kinds), [int(size) for size in _splitList(options.sizes)],
+                                   [int(seed) for seed in _splitList(options.seeds)], options.food)
+    results = runBenchmark(layouts, cases(_splitList(options.algorithms), _splitList(options.problems)),
+                           options.timeout, options.memory)
+
+    baseline = None
+    if options.baseline:
+        with open(options.baseline) as f:
+            baseline = json.load(f)
+    printRows(results, baseline)
+    if options.json:
+        with open(options.json, 'w') as f:
+            json.dump(results, f, indent=1)
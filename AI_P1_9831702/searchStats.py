@@ -0,0 +1,170 @@
+# searchStats.py
+# --------------
+# Licensing Information:  You are free to use or extend these projects for
+# educational purposes provided that (1) you do not distribute or publish
+# solutions, (2) you retain this notice, and (3) you provide clear
+# attribution to UC Berkeley, including a link to http://ai.berkeley.edu.
+#
+# Attribution Information: The Pacman AI projects were developed at UC Berkeley.
+# The core projects and autograders were primarily created by John DeNero
+# (denero@cs.berkeley.edu) and Dan Klein (klein@cs.berkeley.edu).
+# Student side autograding was added by Brad Miller, Nick Hay, and
+# Pieter Abbeel (pabbeel@cs.berkeley.edu).
+
+
+"""
+Instrumentation for the search functions in search.py.
+
+Attach a SearchStats object to a problem before searching it:
+
+  problem.searchStats = SearchStats('astar', 'FoodSearchProblem', [printStats])
+  search.aStarSearch(problem, foodHeuristic)
+
+While the search runs, the problem's getSuccessors, getPredecessors and
+isGoalState, and the heuristic, are wrapped to count and time their calls,
+and the search reports its fringe and closed set sizes after every
+expansion.  When it returns, every listener is called with the stats.  A
+problem without searchStats is searched with no wrapping at all, so
+collection costs nothing when it is disabled.
+
+From the command line, pass stats=print or stats=<file> to a SearchAgent,
+for example:
+
+> python pacman.py -p SearchAgent -a fn=astar,prob=FoodSearchProblem,heuristic=foodHeuristic,stats=stats.json
+"""
+
+import json
+import time
+
+class SearchStats:
+    """
+    Statistics about one run of a search function:
+
+      expanded        states expanded (calls to getSuccessors or getPredecessors)
+      generated       successors returned by those calls
+      duplicates      generated successors whose state had been generated before
+      maxFringe       largest fringe size seen after an expansion
+      maxClosed       largest closed set (or transposition table) size seen
+      heuristicCalls  states estimated by the heuristic, and heuristicTime
+                      seconds spent on them
+      goalTests       calls to isGoalState, and goalTestTime seconds in them
+      totalTime       wall clock seconds for the whole search
+      pathLength      number of actions returned, or None if no path was found
+    """
+    FIELDS = ('algorithm', 'problem', 'expanded', 'generated', 'duplicates', 'maxFringe', 'maxClosed',
+              'heuristicCalls', 'heuristicTime', 'goalTests', 'goalTestTime', 'totalTime', 'pathLength')
+
+    __slots__ = FIELDS + ('listeners', 'extra', '_seen', '_start', '_problem')
+
+    def __init__(self, algorithm='', problem='', listeners=()):
+        self.algorithm = algorithm
+        self.problem = problem
+        self.listeners = list(listeners)
+        self.extra = {} # anything else a search function wants to report
+        self.expanded = self.generated = self.duplicates = 0
+        self.maxFringe = self.maxClosed = 0
+        self.heuristicCalls = self.goalTests = 0
+        self.heuristicTime = self.goalTestTime = self.totalTime = 0.0
+        self.pathLength = None
+        self._seen = set()
+        self._start = None
+        self._problem = None
+
+    def begin(self, problem, heuristic=None):
+        """
+        Called by a search function before it starts.  Wraps the problem's
+        methods and returns the heuristic to use instead of heuristic.
+        """
+        self._start = time.perf_counter()
+        self._problem = problem
+        problem.isGoalState = self._timeGoalTest(problem.isGoalState)
+        problem.getSuccessors = self._countExpansion(problem.getSuccessors)
+        if hasattr(problem, 'getPredecessors'):
+            problem.getPredecessors = self._countExpansion(problem.getPredecessors)
+        if heuristic is None:
+            return None
+        return self._timeHeuristic(heuristic)
+
+    def sample(self, fringeSize, closedSize):
+        "Called by a search function after each expansion"
+        if fringeSize > self.maxFringe:
+            self.maxFringe = fringeSize
+        if closedSize > self.maxClosed:
+            self.maxClosed = closedSize
+
+    def end(self, actions):
+        "Called by a search function with the actions it is about to return"
+        self.totalTime = time.perf_counter() - self._start
+        self.pathLength = None if actions is None else len(actions)
+        # drop the wrappers, the class methods show through again
+        for name in ('isGoalState', 'getSuccessors', 'getPredecessors'):
+            self._problem.__dict__.pop(name, None)
+        self._problem = None
+        self._seen = set()
+        for listener in self.listeners:
+            listener(self)
+        return actions
+
+    def asDict(self):
+        "Returns the statistics as a dictionary of plain values"
+        values = dict((field, getattr(self, field)) for field in self.FIELDS)
+        values.update(self.extra)
+        return values
+
+    def _timeGoalTest(self, isGoalState):
+        def timedGoalTest(state):
+            start = time.perf_counter()
+            result = isGoalState(state)
+            self.goalTestTime += time.perf_counter() - start
+            self.goalTests += 1
+            return result
+        return timedGoalTest
+
+    def _timeHeuristic(self, heuristic):
+        def timedHeuristic(state, problem=None):
+            start = time.perf_counter()
+            result = heuristic(state, problem)
+            self.heuristicTime += time.perf_counter() - start
+            self.heuristicCalls += 1
+            return result
+        batch = getattr(heuristic, 'batch', None)
+        if batch is not None:
+            def timedBatch(states, problem=None):
+                start = time.perf_counter()
+                result = batch(states, problem)
+                self.heuristicTime += time.perf_counter() - start
+                self.heuristicCalls += len(states)
+                return result
+            timedHeuristic.batch = timedBatch
+        return timedHeuristic
+
+    def _countExpansion(self, expand):
+        def countedExpansion(state):
+            successors = expand(state)
+            seen = self._seen
+            self.expanded += 1
+            self.generated += len(successors)
+            for successor in successors:
+                if successor[0] in seen:
+                    self.duplicates += 1
+                else:
+                    seen.add(successor[0])
+            return successors
+        return countedExpansion
+
+def printStats(stats):
+    "A listener that prints a one line summary"
+    print('[SearchStats] %s on %s: %d expanded, %d generated, %d duplicates, fringe peak %d, closed peak %d, '
+          '%d heuristic calls (%.3fs), %d goal tests (%.3fs), %.3fs total'
+          % (stats.algorithm, stats.problem, stats.expanded, stats.generated, stats.duplicates,
+             stats.maxFringe, stats.maxClosed, stats.heuristicCalls, stats.heuristicTime,
+             stats.goalTests, stats.goalTestTime, stats.totalTime))
+
+class JSONSink:
+    "A listener that appends every search's statistics to a file, one JSON object per line"
+    def __init__(self, path):
+        self.path = path
+
+    def __call__(self, stats):
+        with open(self.path, 'a') as f:
+            f.write(json.dumps(stats.asDict()) + '\n')
@@ -29,6 +29,7 @@
 import sys
 import inspect
 import heapq, random
+import collections
 
 
 class FixedRandom:
@@ -152,17 +153,19 @@ class Stack:
         "Returns true if the stack is empty"
         return len(self.list) == 0
 
+    def __len__(self):
+        return len(self.list)
+
 class Queue:
     "A container with a first-in-first-out (FIFO) queuing policy."
     def __init__(self):
-        self.list = []
+        self.list = collections.deque()
 
     def push(self,item):
         "Enqueue the 'item' into the queue"
 
         "*** YOUR MAY CODE HERE ***"
-        self.list.insert(0,item)       # insert(0,item) inserts at the front of the list.
-        # self.list.append(item)       appends an element to the end of the list.
+        self.list.append(item)         # appends an element to the back of the deque in O(1).
 
     def pop(self):
         """
@@ -171,12 +174,15 @@ class Queue:
         """
 
         "*** YOUR MAY CODE HERE ***"
-        return self.list.pop()        # removes and returns the last value from the List
+        return self.list.popleft()    # removes and returns the front value of the deque in O(1)
 
     def isEmpty(self):
         "Returns true if the queue is empty"
         return len(self.list) == 0
 
+    def __len__(self):
+        return len(self.list)
+
 class PriorityQueue:
     """
       Implements a priority queue data structure. Each inserted item
@@ -200,6 +206,9 @@ class PriorityQueue:
     def isEmpty(self):
         return len(self.heap) == 0
 
+    def __len__(self):
+        return len(self.heap)
+
     def update(self, item, priority):
         # If item already in priority queue with higher priority, update its priority and rebuild the heap.
         # If item already in priority queue with equal or lower priority, do nothing.
@@ -216,9 +225,138 @@ class PriorityQueue:
                 self.heap.append((priority, c, item))
                 heapq.heapify(self.heap)
                 break
+        else:
+            # If item not in priority queue, do the same thing as self.push.
+            self.push(item, priority)
+
+class IndexedPriorityQueue:
+    """
+      Implements a priority queue that also remembers where each item sits in
+      its binary heap.  An item can be in the queue at most once, so items
+      must be hashable.  Keeping the item->position map lets the queue find
+      an item in O(1) and change its priority (decrease-key) or remove it in
+      O(log n), instead of scanning and re-heapifying like
+      PriorityQueue.update.  Ties are broken by insertion order; an item whose
+      priority changes counts as inserted again.
+    """
+    def  __init__(self):
+        self.heap = []          # entries are [priority, count, item]
+        self.position = {}      # item -> index of its entry in self.heap
+        self.count = 0
+
+    def push(self, item, priority):
+        "Adds item with the given priority, or resets its priority if it is already queued"
+        if item in self.position:
+            self._setPriority(self.position[item], priority)
+            return
+        self.heap.append([priority, self.count, item])
+        self.position[item] = len(self.heap) - 1
+        self.count += 1
+        self._siftUp(len(self.heap) - 1)
+
+    def pop(self):
+        "Removes and returns the item with the lowest priority"
+        return self._removeAt(0)
+
+    def isEmpty(self):
+        return len(self.heap) == 0
+
+    def update(self, item, priority):
+        """
+          Same contract as PriorityQueue.update: lowers the priority of a
+          queued item, pushes an item that is not queued and otherwise does
+          nothing.  Returns True if the queue was changed.
+        """
+        index = self.position.get(item)
+        if index is None:
+            self.push(item, priority)
+            return True
+        if self.heap[index][0] <= priority:
+            return False
+        self._setPriority(index, priority)
+        return True
+
+    def remove(self, item):
+        "Removes item from the queue.  Raises KeyError if it is not queued"
+        self._removeAt(self.position[item])
+
+    def getPriority(self, item):
+        "Returns the priority item is queued with.  Raises KeyError if it is not queued"
+        return self.heap[self.position[item]][0]
+
+    def peekPriority(self):
+        "Returns the lowest priority in the queue without removing its item"
+        return self.heap[0][0]
+
+    def __contains__(self, item):
+        return item in self.position
+
+    def __len__(self):
+        return len(self.heap)
+
+    def __iter__(self):
+        "Iterates over the queued items, in no particular order"
+        return iter(self.position)
+
+    def _setPriority(self, index, priority):
+        # the entry also gets a new count, so among equal priorities it
+        # comes after the items queued before it, as if it were pushed again
+        entry = self.heap[index]
+        old = entry[0]
+        entry[0] = priority
+        entry[1] = self.count
+        self.count += 1
+        if priority < old:
+            self._siftUp(index)
+        else:
+            self._siftDown(index)
+
+    def _removeAt(self, index):
+        heap = self.heap
+        entry = heap[index]
+        del self.position[entry[2]]
+        last = heap.pop()
+        if index < len(heap):
+            heap[index] = last
+            self.position[last[2]] = index
+            if last < entry:
+                self._siftUp(index)
             else:
-                # If item not in priority queue, do the same thing as self.push.
-                self.push(item, priority)
+                self._siftDown(index)
+        return entry[2]
+
+    def _siftUp(self, index):
+        heap, position = self.heap, self.position
+        entry = heap[index]
+        while index > 0:
+            parentIndex = (index - 1) >> 1
+            parent = heap[parentIndex]
+            if not entry < parent:
+                break
+            heap[index] = parent
+            position[parent[2]] = index
+            index = parentIndex
+        heap[index] = entry
+        position[entry[2]] = index
+
+    def _siftDown(self, index):
+        heap, position = self.heap, self.position
+        size = len(heap)
+        entry = heap[index]
+        while True:
+            childIndex = 2 * index + 1
+            if childIndex >= size:
+                break
+            if childIndex + 1 < size and heap[childIndex + 1] < heap[childIndex]:
+                childIndex += 1
+            child = heap[childIndex]
+            if not child < entry:
+                break
+            heap[index] = child
+            position[child[2]] = index
+            index = childIndex
+        heap[index] = entry
+        position[entry[2]] = index
 
 class PriorityQueueWithFunction(PriorityQueue):
     """
@@ -237,6 +375,42 @@ class PriorityQueueWithFunction(PriorityQueue):
         PriorityQueue.push(self, item, self.priorityFunction(item))
 
 
+class LRUCache:
+    """
+      A dictionary with a fixed capacity.  Once it holds capacity keys,
+      storing a new key evicts the least recently used one, and onEvict, if
+      given, is called with its value.  Both get and setting a key count as
+      a use.
+    """
+    def  __init__(self, capacity, onEvict=None):
+        self.capacity = capacity
+        self.onEvict = onEvict
+        self.data = collections.OrderedDict()
+
+    def get(self, key, default=None):
+        "Returns the value stored for key, or default if it is not cached"
+        try:
+            value = self.data[key]
+        except KeyError:
+            return default
+        self.data.move_to_end(key)
+        return value
+
+    def __setitem__(self, key, value):
+        self.data[key] = value
+        self.data.move_to_end(key)
+        if len(self.data) > self.capacity:
+            key, evicted = self.data.popitem(last=False)
+            if self.onEvict is not None:
+                self.onEvict(evicted)
+
+    def __contains__(self, key):
+        return key in self.data
+
+    def __len__(self):
+        return len(self.data)
+
+
 def manhattanDistance( xy1, xy2 ):
     "Returns the Manhattan distance between points xy1 and xy2"
     return abs( xy1[0] - xy2[0] ) + abs( xy1[1] - xy2[1] )
@@ -0,0 +1,99 @@
+# moveOrdering.py
+# ---------------
+# Licensing Information:  You are free to use or extend these projects for
+# educational purposes provided that (1) you do not distribute or publish
+# solutions, (2) you retain this notice, and (3) you provide clear
+# attribution to UC Berkeley, including a link to http://ai.berkeley.edu.
+#
+# Attribution Information: The Pacman AI projects were developed at UC Berkeley.
+# The core projects and autograders were primarily created by John DeNero
+# (denero@cs.berkeley.edu) and Dan Klein (klein@cs.berkeley.edu).
+# Student side autograding was added by Brad Miller, Nick Hay, and
+# Pieter Abbeel (pabbeel@cs.berkeley.edu).
+
+
+"""
+Move ordering for AlphaBetaAgent in multiAgents.py.
+
+Alpha-beta prunes the most when every node tries its best move first.  An
+ordering is an object with three methods, called by the search:
+
+  newSearch()                      before every move
+  order(gameState, agentIndex, ply, actions, bestMove)
+                                   returns actions in the order to try them;
+                                   bestMove is the transposition table's
+                                   best move for the node, or None
+  cutoff(gameState, agentIndex, ply, action, depth)
+                                   action caused a cutoff at a node whose
+                                   subtree still has depth levels of Pacman
+                                   moves, counting the node's own level
+
+ply identifies the node's level in the tree: (depth, agentIndex), where
+depth counts Pacman moves from the root.  Choose one with the ordering
+agent argument:
+
+> python pacman.py -p AlphaBetaAgent -a depth=4,ttSize=65536,ordering=KillerHistoryOrder
+"""
+
+class GameOrder:
+    "Tries the actions in the order getLegalActions returns them"
+    def newSearch(self):
+        pass
+
+    def order(self, gameState, agentIndex, ply, actions, bestMove):
+        return actions
+
+    def cutoff(self, gameState, agentIndex, ply, action, depth):
+        pass
+
+class KillerHistoryOrder:
+    """
+    Tries the transposition table's best move first, then the killer moves
+    of the ply (the last KILLERS moves that caused a cutoff at that level of
+    the tree), then the other actions by their history score.
+
+    The history score of moving an agent in a direction from a cell grows by
+    depth^2 every time it causes a cutoff anywhere in the tree, so moves
+    that refute deep subtrees count the most.  The scores are halved before
+    every move, to forget old positions.  Pacman and the ghosts have
+    separate killers and scores.
+    """
+    KILLERS = 2
+
+    def __init__(self):
+        self.killers = {}   # ply -> actions, most recent first
+        self.history = {}   # (agentIndex, position, action) -> score
+
+    def newSearch(self):
+        self.killers = {}
+        for move in list(self.history):
+            self.history[move] //= 2
+            if not self.history[move]:
+                del self.history[move]
+
+    def order(self, gameState, agentIndex, ply, actions, bestMove):
+        first = []
+        if bestMove in actions:
+            first.append(bestMove)
+        for killer in self.killers.get(ply, ()):
+            if killer in actions and killer not in first:
+                first.append(killer)
+        position = _position(gameState, agentIndex)
+        history = self.history
+        rest = [action for action in actions if action not in first]
+        rest.sort(key=lambda action: -history.get((agentIndex, position, action), 0))
+        return first + rest
+
+    def cutoff(self, gameState, agentIndex, ply, action, depth):
+        killers = self.killers.setdefault(ply, [])
+        if action in killers:
+            killers.remove(action)
+        killers.insert(0, action)
+        del killers[self.KILLERS:]
+        move = (agentIndex, _position(gameState, agentIndex), action)
+        self.history[move] = self.history.get(move, 0) + depth * depth
+
+def _position(gameState, agentIndex):
+    if agentIndex == 0:
+        return gameState.getPacmanPosition()
+    return gameState.getGhostPosition(agentIndex)
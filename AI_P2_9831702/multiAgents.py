@@ -15,8 +15,12 @@
 from util import manhattanDistance
 from game import Directions
 import random, util
+import multiprocessing
+import time
 
 from game import Agent
+from transpositionTable import TranspositionTable, ZobristHasher
+from moveOrdering import GameOrder, KillerHistoryOrder
 
 class ReflexAgent(Agent):
     """
@@ -103,6 +107,10 @@ def scoreEvaluationFunction(currentGameState):
     """
     return currentGameState.getScore()
 
+class SearchTimeout(Exception):
+    "Raised by MultiAgentSearchAgent.visitNode when a timed search runs out of time"
+    pass
+
 class MultiAgentSearchAgent(Agent):
     """
     This class provides some common elements to all of your
@@ -118,11 +126,208 @@ class MultiAgentSearchAgent(Agent):
     is another abstract class.
     """
 
-    def __init__(self, evalFn = 'scoreEvaluationFunction', depth = '2'):
+    def __init__(self, evalFn = 'scoreEvaluationFunction', depth = '2', ttSize = '0', timeLimit = '0', workers = '0'):
         self.index = 0 # Pacman is always agent index 0
         self.evaluationFunction = util.lookup(evalFn, globals())
         self.depth = int(depth)
 
+        # Transposition table with ttSize slots (transpositionTable.py), kept
+        # from move to move; 0 searches without one
+        self.transpositions = None
+        if int(ttSize) > 0:
+            self.transpositions = TranspositionTable(int(ttSize))
+            self.hasher = ZobristHasher()
+
+        # Seconds per move; with a time limit, depth is the deepest iteration
+        # of an iterative deepening search (see iterativeDeepening)
+        self.timeLimit = float(timeLimit)
+        self.depthLimit = self.depth # the depth of the search in progress
+        self.deadline = None
+        self.nodeCount = 0 # nodes visited while choosing the last action
+        self.searchCount = 0 # calls of newSearch, one per move
+
+        # With more than one worker, the root actions are searched in a pool
+        # of worker processes (see parallelSearchRoot), created on first use
+        self.workers = int(workers)
+        self.pool = None
+        # the best root value found so far, read by every node without a
+        # lock; alphaLock is only taken to raise it
+        self.sharedAlpha = None
+        self.alphaLock = None
+        self.rootValue = None # the value of the last searchRoot
+
+    def iterativeDeepening(self, gameState):
+        """
+        Returns the action of a search of gameState to self.depth.
+
+        With a time limit, searches to depth 1, 2, ... self.depth instead,
+        each time trying the previous iteration's action first, and returns
+        the action of the deepest iteration that finished in time.  The
+        first iteration always finishes, so there is always an action.
+        """
+        self.nodeCount = 0
+        self.newSearch()
+        if self.timeLimit <= 0:
+            return self.searchDepth(gameState, self.depth)
+
+        deadline = time.perf_counter() + self.timeLimit
+        bestAction = self.searchDepth(gameState, 1)
+        self.deadline = deadline
+        try:
+            for depth in range(2, self.depth + 1):
+                bestAction = self.searchDepth(gameState, depth, bestAction)
+        except SearchTimeout:
+            pass
+        finally:
+            self.deadline = None
+        return bestAction
+
+    def newSearch(self):
+        "Called before every move, in the agent and in each of its workers"
+        self.searchCount += 1
+        if self.transpositions is not None:
+            self.transpositions.newSearch()
+
+    def searchDepth(self, gameState, depth, preferredAction=None):
+        "Returns the best action of a search of gameState to depth, in parallel if there are workers"
+        if self.workers > 1:
+            return self.parallelSearchRoot(gameState, depth, preferredAction)
+        return self.searchRoot(gameState, depth, preferredAction)
+
+    def searchRoot(self, gameState, depth, preferredAction=None, actions=None):
+        """
+        Returns the best action of a search of gameState to depth, trying
+        preferredAction first, and sets self.rootValue to its value.  If
+        actions is given, only those root actions are searched.
+        """
+        util.raiseNotDefined()
+
+    # Alpha-beta searches the first root action (the eldest brother) before
+    # sending the others to the workers, so that they start with its value
+    # as a bound
+    youngBrothersWait = False
+
+    def parallelSearchRoot(self, gameState, depth, preferredAction=None):
+        """
+        Searches the root actions of gameState in the worker pool, one task
+        per action, and returns the same action as searchRoot.
+
+        The workers share the best root value found so far in sharedAlpha.
+        Alpha-beta raises the alpha of every node it enters to it, so an
+        action is cut off as soon as it cannot beat one finished elsewhere.
+        """
+        actions = self.preferredFirst(gameState.getLegalActions(0), preferredAction)
+        if self.pool is None:
+            self.sharedAlpha = multiprocessing.RawValue('d', -float('inf'))
+            self.alphaLock = multiprocessing.Lock()
+            self.pool = multiprocessing.Pool(self.workers, initializer=_initWorker,
+                                             initargs=(self, self.sharedAlpha, self.alphaLock))
+        self.sharedAlpha.value = -float('inf')
+
+        values = []
+        if self.youngBrothersWait:
+            self.searchRoot(gameState, depth, None, actions[:1])
+            values.append(self.rootValue)
+            self.sharedAlpha.value = self.rootValue
+
+        # the deadline on the wall clock, which all processes share; a task
+        # that waited in the queue gets only the time that is left
+        deadline = None
+        if self.deadline is not None:
+            deadline = time.time() + (self.deadline - time.perf_counter())
+        tasks = [self.pool.apply_async(_searchRootAction, (gameState, self.searchCount, depth, action, deadline))
+                 for action in actions[len(values):]]
+        # wait for every task, even after a timeout, so none is left running
+        results = [task.get() for task in tasks]
+        for value, nodeCount in results:
+            self.nodeCount += nodeCount
+        if None in [value for value, nodeCount in results]:
+            raise SearchTimeout()
+        values.extend(value for value, nodeCount in results)
+
+        # the first action with the best value, as in the serial root loop;
+        # an action cut off by the shared alpha returns less than the best
+        bestIndex = 0
+        for index in range(1, len(actions)):
+            if values[index] > values[bestIndex]:
+                bestIndex = index
+        self.rootValue = values[bestIndex]
+        return actions[bestIndex]
+
+    def __getstate__(self):
+        "Workers that are not forked get the agent without its pool and shared bound"
+        state = self.__dict__.copy()
+        state['pool'] = state['sharedAlpha'] = state['alphaLock'] = None
+        return state
+
+    def visitNode(self):
+        "Called at every node: counts it, and stops the search once the move's time is up"
+        self.nodeCount += 1
+        if self.deadline is not None and time.perf_counter() > self.deadline:
+            raise SearchTimeout()
+
+    def preferredFirst(self, actions, preferredAction):
+        "Returns actions with preferredAction, if it is one of them, moved to the front"
+        if preferredAction not in actions:
+            return actions
+        return [preferredAction] + [action for action in actions if action != preferredAction]
+
+    def rootKey(self, gameState):
+        "Returns the hash of gameState, or None without a transposition table"
+        if self.transpositions is None:
+            return None
+        return self.hasher.hashState(gameState, self.index)
+
+    def successorKey(self, key, gameState, agentIndex, successor, depth):
+        """
+        Returns the hash of successor = gameState.generateSuccessor(agentIndex, ...),
+        which is searched at depth, or None without a transposition table.
+        Leaves are evaluated without the table, so they get None too.
+        """
+        if key is None or (depth == self.depthLimit and agentIndex == gameState.getNumAgents() - 1):
+            return None
+        return self.hasher.hashSuccessor(key, gameState, agentIndex, successor)
+
+# The agent of a worker process of MultiAgentSearchAgent.parallelSearchRoot
+_workerAgent = None
+
+def _initWorker(agent, sharedAlpha, alphaLock):
+    global _workerAgent
+    _workerAgent = agent
+    agent.sharedAlpha, agent.alphaLock = sharedAlpha, alphaLock
+    # a forked worker inherits the parent's table; each starts with an empty one
+    if agent.transpositions is not None:
+        agent.transpositions = TranspositionTable(agent.transpositions.size)
+
+def _searchRootAction(gameState, searchCount, depth, action, deadline):
+    """
+    Searches one root action in a worker process.  Returns (value, nodes
+    visited), with value None if the search ran out of time or the task
+    started after deadline, a time.time() value or None.  searchCount is
+    the agent's, so the first task of each move in a worker calls newSearch
+    there too.
+    """
+    agent = _workerAgent
+    if agent.searchCount != searchCount:
+        agent.newSearch()
+        agent.searchCount = searchCount
+    agent.nodeCount = 0
+    if deadline is not None:
+        timeLeft = deadline - time.time()
+        if timeLeft <= 0:
+            return None, 0
+        agent.deadline = time.perf_counter() + timeLeft
+    try:
+        agent.searchRoot(gameState, depth, None, [action])
+    except SearchTimeout:
+        return None, agent.nodeCount
+    finally:
+        agent.deadline = None
+    with agent.alphaLock:
+        if agent.rootValue > agent.sharedAlpha.value:
+            agent.sharedAlpha.value = agent.rootValue
+    return agent.rootValue, agent.nodeCount
+
 class MinimaxAgent(MultiAgentSearchAgent):
     """
     Your minimax agent (question 2)
@@ -152,50 +357,85 @@ class MinimaxAgent(MultiAgentSearchAgent):
         Returns whether or not the game state is a losing state
         """
         "*** YOUR CODE HERE ***"
+        return self.iterativeDeepening(gameState)
+
+    def searchRoot(self, gameState, depth, preferredAction=None, actions=None):
+        "Returns the minimax action of a search to depth, trying preferredAction first"
+        self.depthLimit = depth
         Infinity = float('inf')
+        table = self.transpositions
 
-        def maxValue(gameState, depth):
+        def maxValue(gameState, depth, key):
+            self.visitNode()
             actions = gameState.getLegalActions(0)
 
-            if not actions or depth == self.depth:   #Terminal Test 
+            if not actions or depth == self.depthLimit:   #Terminal Test
                 return self.evaluationFunction(gameState)
-            
+
+            if table is not None:
+                value = table.lookup(key, self.depthLimit - depth)
+                if value is not None:
+                    return value
+
             v = -Infinity
+            bestAction = None
             for action in actions:
                 successor = gameState.generateSuccessor(0, action)
-                v = max (v, minValue(successor, depth + 1, 1))
+                newV = minValue(successor, depth + 1, 1, self.successorKey(key, gameState, 0, successor, depth + 1))
+                if newV > v:
+                    v, bestAction = newV, action
+
+            if table is not None:
+                table.store(key, self.depthLimit - depth, v, bestAction)
             return v
-        
-        def minValue(gameState, depth, agentIndex):
+
+        def minValue(gameState, depth, agentIndex, key):
+            self.visitNode()
             actions = gameState.getLegalActions(agentIndex)
 
-            if not actions:   #Terminal Test 
+            if not actions:   #Terminal Test
                 return self.evaluationFunction(gameState)
-            
+
+            if table is not None:
+                value = table.lookup(key, self.depthLimit - depth)
+                if value is not None:
+                    return value
+
             v = Infinity
+            bestAction = None
             for action in actions:
                 successor = gameState.generateSuccessor(agentIndex, action)
-                
+                successorKey = self.successorKey(key, gameState, agentIndex, successor, depth)
+
                 # last ghost
                 if agentIndex == (gameState.getNumAgents() - 1):
-                    v = min (v, maxValue(successor, depth))
+                    newV = maxValue(successor, depth, successorKey)
                 else:
-                    v = min (v, minValue(successor, depth, agentIndex + 1))
+                    newV = minValue(successor, depth, agentIndex + 1, successorKey)
+                if newV < v:
+                    v, bestAction = newV, action
+
+            if table is not None:
+                table.store(key, self.depthLimit - depth, v, bestAction)
             return v
-        
+
 
         # Root level action
-        actions = gameState.getLegalActions(0)
+        if actions is None:
+            actions = gameState.getLegalActions(0)
+        actions = self.preferredFirst(actions, preferredAction)
+        key = self.rootKey(gameState)
         v = -Infinity
         bestAction = actions[0]
         for action in actions:
             successor = gameState.generateSuccessor(0, action)
             # Next level is a min level
-            newV = minValue(successor, 1, 1)
+            newV = minValue(successor, 1, 1, self.successorKey(key, gameState, 0, successor, 1))
             # Choosing the action which is Maximum of the successors.
             if newV > v:
                 bestAction = action
                 v = newV
+        self.rootValue = v
         return bestAction
 
 class AlphaBetaAgent(MultiAgentSearchAgent):
@@ -203,52 +443,119 @@ class AlphaBetaAgent(MultiAgentSearchAgent):
     Your minimax agent with alpha-beta pruning (question 3)
     """
 
+    def __init__(self, evalFn = 'scoreEvaluationFunction', depth = '2', ttSize = '0', timeLimit = '0', workers = '0', ordering = 'GameOrder'):
+        MultiAgentSearchAgent.__init__(self, evalFn, depth, ttSize, timeLimit, workers)
+        # The order in which nodes try their actions (moveOrdering.py)
+        self.ordering = util.lookup(ordering, globals())()
+
+    youngBrothersWait = True
+
     def getAction(self, gameState):
         """
         Returns the minimax action using self.depth and self.evaluationFunction
         """
         "*** YOUR CODE HERE ***"
+        return self.iterativeDeepening(gameState)
+
+    def newSearch(self):
+        MultiAgentSearchAgent.newSearch(self)
+        self.ordering.newSearch()
+
+    def searchRoot(self, gameState, depth, preferredAction=None, actions=None):
+        "Returns the alpha-beta action of a search to depth, trying preferredAction first"
+        self.depthLimit = depth
         Infinity = float('inf')
+        table = self.transpositions
+        ordering = self.ordering
 
-        def minValue(state, depth, agentIndex, a, b):
+        def minValue(state, depth, agentIndex, a, b, key):
+            self.visitNode()
+            if self.sharedAlpha is not None:
+                a = max(a, self.sharedAlpha.value)
             actions = state.getLegalActions(agentIndex)
             if not actions:
                 return self.evaluationFunction(state)
 
+            # the window this node is searched with; the value returned is
+            # exact inside it, and a bound outside it
+            windowA, windowB = a, b
+            bestMove = None
+            if table is not None:
+                value = table.lookup(key, self.depthLimit - depth, a, b)
+                if value is not None:
+                    return value
+                bestMove = table.bestMove(key)
+
             v = Infinity
-            for action in actions:
+            bestAction = None
+            for action in ordering.order(state, agentIndex, (depth, agentIndex), actions, bestMove):
                 successor = state.generateSuccessor(agentIndex, action)
+                successorKey = self.successorKey(key, state, agentIndex, successor, depth)
 
                 # last ghost
                 if agentIndex == (state.getNumAgents() - 1):
-                    v = min (v, maxValue(successor, depth, a, b))
+                    newV = maxValue(successor, depth, a, b, successorKey)
                 else:
-                    v = min (v, minValue(successor, depth, agentIndex + 1, a, b))
+                    newV = minValue(successor, depth, agentIndex + 1, a, b, successorKey)
+                if newV < v:
+                    v, bestAction = newV, action
 
                 if v < a:
-                    return v
+                    ordering.cutoff(state, agentIndex, (depth, agentIndex), action, self.depthLimit - depth + 1)
+                    break
                 b = min(b, v)
+
+            if table is not None:
+                if self.sharedAlpha is not None:
+                    # nodes below may have been searched with a higher
+                    # shared alpha than this one, so v is only exact above it
+                    windowA = max(windowA, self.sharedAlpha.value)
+                table.store(key, self.depthLimit - depth, v, bestAction, windowA, windowB)
             return v
 
-        def maxValue(state, depth, a, b):
+        def maxValue(state, depth, a, b, key):
+            self.visitNode()
+            if self.sharedAlpha is not None:
+                a = max(a, self.sharedAlpha.value)
             actions = state.getLegalActions(0)
-            if not actions or depth == self.depth:
+            if not actions or depth == self.depthLimit:
                 return self.evaluationFunction(state)
 
+            windowA, windowB = a, b
+            bestMove = None
+            if table is not None:
+                value = table.lookup(key, self.depthLimit - depth, a, b)
+                if value is not None:
+                    return value
+                bestMove = table.bestMove(key)
+
             v = -Infinity
-            
-            for action in actions:
+            bestAction = None
+
+            for action in ordering.order(state, 0, (depth, 0), actions, bestMove):
                 successor = state.generateSuccessor(0, action)
-                v = max(v, minValue(successor, depth + 1, 1, a, b))
+                newV = minValue(successor, depth + 1, 1, a, b, self.successorKey(key, state, 0, successor, depth + 1))
+                if newV > v:
+                    v, bestAction = newV, action
 
                 if v > b:
-                    return v
+                    ordering.cutoff(state, 0, (depth, 0), action, self.depthLimit - depth + 1)
+                    break
                 a = max(a, v)
 
+            if table is not None:
+                if self.sharedAlpha is not None:
+                    # nodes below may have been searched with a higher
+                    # shared alpha than this one, so v is only exact above it
+                    windowA = max(windowA, self.sharedAlpha.value)
+                table.store(key, self.depthLimit - depth, v, bestAction, windowA, windowB)
             return v
 
         # Root level action
-        actions = gameState.getLegalActions(0)
+        if actions is None:
+            actions = gameState.getLegalActions(0)
+        actions = self.preferredFirst(actions, preferredAction)
+        key = self.rootKey(gameState)
         v = -Infinity
         a = -Infinity
         b = Infinity
@@ -257,15 +564,16 @@ class AlphaBetaAgent(MultiAgentSearchAgent):
         for action in actions:
             successor = gameState.generateSuccessor(0, action)
             # Next level is a min level. Hence calling min for successors of the root.
-            newV = minValue(successor, 1, 1, a, b)
+            newV = minValue(successor, 1, 1, a, b, self.successorKey(key, gameState, 0, successor, 1))
             # Choosing the action which is Maximum of the successors.
             if newV > v:
                 bestAction = action
                 v = newV
                
             if newV > b:
-                return bestAction
+                break
             a = max(a,newV)
+        self.rootValue = v
         return bestAction
 
 class ExpectimaxAgent(MultiAgentSearchAgent):
@@ -281,51 +589,83 @@ class ExpectimaxAgent(MultiAgentSearchAgent):
         legal moves.
         """
         "*** YOUR CODE HERE ***"
+        return self.iterativeDeepening(gameState)
+
+    def searchRoot(self, gameState, depth, preferredAction=None, actions=None):
+        "Returns the expectimax action of a search to depth, trying preferredAction first"
+        self.depthLimit = depth
         Infinity = float('inf')
+        table = self.transpositions
 
-        def maxValue(gameState,depth):
+        def maxValue(gameState,depth, key):
+            self.visitNode()
 
             actions = gameState.getLegalActions(0)
-            if not actions or depth == self.depth:
+            if not actions or depth == self.depthLimit:
                 return self.evaluationFunction(gameState)
 
+            if table is not None:
+                value = table.lookup(key, self.depthLimit - depth)
+                if value is not None:
+                    return value
+
             v = -Infinity
+            bestAction = None
             for action in actions:
                 successor= gameState.generateSuccessor(0, action)
-                v = max (v, expectedValue(successor, depth + 1, 1))
+                newV = expectedValue(successor, depth + 1, 1, self.successorKey(key, gameState, 0, successor, depth + 1))
+                if newV > v:
+                    v, bestAction = newV, action
+
+            if table is not None:
+                table.store(key, self.depthLimit - depth, v, bestAction)
             return v
         
         #For all ghosts.
-        def expectedValue(gameState, depth, agentIndex):
+        def expectedValue(gameState, depth, agentIndex, key):
+            self.visitNode()
 
             actions = gameState.getLegalActions(agentIndex)
             if not actions:
                 return self.evaluationFunction(gameState)
 
+            if table is not None:
+                value = table.lookup(key, self.depthLimit - depth)
+                if value is not None:
+                    return value
+
             v = 0.0
             p = 1 / len(actions)
             for action in actions:
                 successor= gameState.generateSuccessor(agentIndex, action)
+                successorKey = self.successorKey(key, gameState, agentIndex, successor, depth)
 
                 # last ghost
                 if agentIndex == (gameState.getNumAgents() - 1):
-                    v += p * maxValue(successor, depth) 
+                    v += p * maxValue(successor, depth, successorKey) 
                 else:
-                    v += p * expectedValue(successor, depth, agentIndex + 1) 
+                    v += p * expectedValue(successor, depth, agentIndex + 1, successorKey) 
+
+            if table is not None:
+                table.store(key, self.depthLimit - depth, v)
             return v
         
         #Root level action.
-        actions = gameState.getLegalActions(0)
+        if actions is None:
+            actions = gameState.getLegalActions(0)
+        actions = self.preferredFirst(actions, preferredAction)
+        key = self.rootKey(gameState)
         v = -Infinity
         bestAction = actions[0]
         for action in actions:
             successor = gameState.generateSuccessor(0, action)
             # Next level is a expect level.
-            newV = expectedValue(successor, 1, 1)
+            newV = expectedValue(successor, 1, 1, self.successorKey(key, gameState, 0, successor, 1))
             # Choosing the action which is Maximum of the successors.
             if newV > v:
                 bestAction = action
                 v = newV
+        self.rootValue = v
         return bestAction
        
 
@@ -0,0 +1,168 @@
+# transpositionTable.py
+# ---------------------
+# Licensing Information:  You are free to use or extend these projects for
+# educational purposes provided that (1) you do not distribute or publish
+# solutions, (2) you retain this notice, and (3) you provide clear
+# attribution to UC Berkeley, including a link to http://ai.berkeley.edu.
+#
+# Attribution Information: The Pacman AI projects were developed at UC Berkeley.
+# The core projects and autograders were primarily created by John DeNero
+# (denero@cs.berkeley.edu) and Dan Klein (klein@cs.berkeley.edu).
+# Student side autograding was added by Brad Miller, Nick Hay, and
+# Pieter Abbeel (pabbeel@cs.berkeley.edu).
+
+
+"""
+A transposition table for the adversarial search agents in multiAgents.py.
+
+Pacman and the ghosts often reach the same position by different move
+orders, for example when two agents step back and forth.  The table keeps
+the value of every searched node under a Zobrist hash of the position, so a
+repeated node is looked up instead of searched again.
+
+A Zobrist hash is the XOR of one random 64 bit key per feature of the
+position: Pacman's position, each ghost's position, direction (ghosts may
+not reverse) and scared timer, every remaining food dot and capsule, the
+score and the agent to move.  The hash of a successor is computed from its
+parent's by XORing out the features that changed and XORing in their new
+keys, so it costs a few dictionary lookups rather than a pass over the
+food grid.
+
+Entries store the remaining search depth, the value, whether the value is
+exact or a lower or upper bound (alpha-beta returns bounds for the nodes it
+prunes) and the best move.  Only entries of exactly the depth being
+searched are used, so a search returns the same values with or without the
+table.  The table has a fixed number of slots; a new entry replaces the old
+one in its slot unless the old one is deeper and was stored during the
+current move.
+
+Enable it with the ttSize agent argument:
+
+> python pacman.py -p AlphaBetaAgent -a depth=3,ttSize=65536
+"""
+
+import random
+
+EXACT, LOWER, UPPER = 'exact', 'lower', 'upper'
+
+class ZobristHasher:
+    "Random 64 bit keys for position features, created the first time each one is seen"
+    def __init__(self, seed=0):
+        self.random = random.Random(seed)
+        self.keys = {}
+
+    def key(self, feature):
+        key = self.keys.get(feature)
+        if key is None:
+            key = self.keys[feature] = self.random.getrandbits(64)
+        return key
+
+    def hashState(self, gameState, agentIndex):
+        "Returns the hash of gameState with agentIndex to move"
+        h = self.key(('turn', agentIndex)) ^ self.key(('score', gameState.getScore()))
+        for index in range(gameState.getNumAgents()):
+            h ^= self.key(_agentFeature(gameState, index))
+        for food in gameState.getFood().asList():
+            h ^= self.key(('food', food))
+        for capsule in gameState.getCapsules():
+            h ^= self.key(('capsule', capsule))
+        return h
+
+    def hashSuccessor(self, h, gameState, agentIndex, successor):
+        """
+        Returns the hash of successor = gameState.generateSuccessor(agentIndex, ...),
+        given h = hashState(gameState, agentIndex).
+        """
+        key = self.key
+        h ^= key(('turn', agentIndex)) ^ key(('turn', (agentIndex + 1) % gameState.getNumAgents()))
+        score, nextScore = gameState.getScore(), successor.getScore()
+        if score != nextScore:
+            h ^= key(('score', score)) ^ key(('score', nextScore))
+        # a ghost's move only changes that ghost; Pacman's can also eat
+        # ghosts, which resets them, or a capsule, which scares them all
+        for index in (range(gameState.getNumAgents()) if agentIndex == 0 else (agentIndex,)):
+            feature, nextFeature = _agentFeature(gameState, index), _agentFeature(successor, index)
+            if feature != nextFeature:
+                h ^= key(feature) ^ key(nextFeature)
+        if agentIndex == 0:
+            x, y = successor.getPacmanPosition()
+            position = (int(x), int(y))
+            if gameState.hasFood(*position):
+                h ^= key(('food', position))
+            if position in gameState.getCapsules():
+                h ^= key(('capsule', position))
+        return h
+
+def _agentFeature(gameState, agentIndex):
+    if agentIndex == 0:
+        return ('pacman', gameState.getPacmanPosition())
+    ghost = gameState.getGhostState(agentIndex)
+    return ('ghost', agentIndex, ghost.getPosition(), ghost.getDirection(), ghost.scaredTimer)
+
+class TranspositionEntry:
+    __slots__ = ('key', 'depth', 'value', 'flag', 'move', 'generation')
+
+    def __init__(self, key, depth, value, flag, move, generation):
+        self.key = key
+        self.depth = depth
+        self.value = value
+        self.flag = flag
+        self.move = move
+        self.generation = generation
+
+class TranspositionTable:
+    """
+    A fixed size table of TranspositionEntry objects, indexed by hash.
+
+    Call newSearch before every move: entries from earlier moves stay usable,
+    but are replaced first.
+    """
+    def __init__(self, size):
+        self.size = size
+        self.entries = [None] * size
+        self.generation = 0
+
+    def newSearch(self):
+        self.generation += 1
+
+    def get(self, key):
+        "Returns the entry stored for key at any depth, or None"
+        entry = self.entries[key % self.size]
+        if entry is None or entry.key != key:
+            return None
+        return entry
+
+    def bestMove(self, key):
+        "Returns the best move stored for key at any depth, or None"
+        entry = self.get(key)
+        return None if entry is None else entry.move
+
+    def lookup(self, key, depth, a=-float('inf'), b=float('inf')):
+        """
+        Returns the stored value of the node key searched to depth if it
+        settles a search with the window (a, b): it is exact, or a bound
+        outside the window.  Returns None otherwise.
+        """
+        entry = self.get(key)
+        if entry is None or entry.depth != depth:
+            return None
+        if entry.flag == EXACT or (entry.flag == LOWER and entry.value > b) or (entry.flag == UPPER and entry.value < a):
+            return entry.value
+        return None
+
+    def store(self, key, depth, value, move=None, a=-float('inf'), b=float('inf')):
+        """
+        Stores value, returned by a search of the node key to depth with the
+        window (a, b).  A value below a is an upper bound of the node's real
+        value and one above b a lower bound.
+        """
+        if value < a:
+            flag = UPPER
+        elif value > b:
+            flag = LOWER
+        else:
+            flag = EXACT
+        slot = key % self.size
+        old = self.entries[slot]
+        if old is None or old.key == key or old.generation != self.generation or depth >= old.depth:
+            self.entries[slot] = TranspositionEntry(key, depth, value, flag, move, self.generation)